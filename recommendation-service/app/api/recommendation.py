@@ -1,7 +1,14 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import multiprocessing
 import time
+import uuid
+import orjson
 from app.models.schemas import (
     RecommendationRequest, 
     RecommendationResponse, 
@@ -13,35 +20,62 @@ from app.models.schemas import (
     RefreshResponse
 )
 from app.utils.logger import get_logger
-from app.services.database_service import DatabaseService
-from app.services.als_service import ALSRecommendationService
+from app.services.database_service import get_database_service
+from app.services.als_service import ALSRecommendationService, rank_scores
+from app.services.batch_history import BATCH_LOG_FILE, extend_batch_history, get_batch_history
+from app.services.batch_queue import RecommendationBatcher
+from app.services.batch_service import run_batch_job
+from app.services.recommendation_cache import get_recommendation_cache
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["recommendations"])
 
-# ALS 서비스 인스턴스 (전역으로 한 번만 로드)
+# API 타입 파라미터 → 추천 타입 매핑
+TYPE_MAPPING = {
+    "log": RecommendationType.RECORD,
+    "place": RecommendationType.PLACE,
+    "plan": RecommendationType.PLAN
+}
+
+# 수동 트리거 가능한 배치 타입
+BATCH_TYPES = frozenset({"full", "incremental"})
+
+# 줄 단위 JSON 스트리밍 응답 타입 (Accept 헤더로 opt-in)
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# ALS 서비스 인스턴스 (애플리케이션 시작 시 한 번만 로드)
 als_service = None
 
-def get_als_service():
-    """ALS 서비스 인스턴스를 반환 (lazy loading)"""
+def init_als_service() -> Optional[ALSRecommendationService]:
+    """ALS 서비스 인스턴스 생성 및 워밍업 (애플리케이션 시작 시 워커 스레드에서 호출)"""
     global als_service
-    if als_service is None:
-        try:
-            logger.info("ALS 서비스 초기화 중...")
-            # 올바른 모델 경로 지정
-            als_service = ALSRecommendationService(model_path="./models")
-            if not als_service.is_loaded:
-                logger.warning("⚠️ ALS 모델 로딩 실패 - 백업 방식 사용")
-                als_service = None
-        except Exception as e:
-            logger.error(f"❌ ALS 서비스 초기화 실패: {str(e)}")
+    try:
+        logger.info("ALS 서비스 초기화 중...")
+        # 올바른 모델 경로 지정
+        als_service = ALSRecommendationService(model_path="./models")
+        if not als_service.is_loaded:
+            logger.warning("⚠️ ALS 모델 로딩 실패 - 백업 방식 사용")
             als_service = None
+        else:
+            als_service.warmup()
+    except Exception as e:
+        logger.error(f"❌ ALS 서비스 초기화 실패: {str(e)}")
+        als_service = None
+    return als_service
+
+# 모델 refresh 직렬화용 (새 인스턴스 구성 → 전역 교체를 한 번에 하나씩)
+_refresh_lock = asyncio.Lock()
+
+async def get_als_service() -> Optional[ALSRecommendationService]:
+    """ALS 서비스 인스턴스를 반환 (FastAPI 의존성, 스레드풀 경유 없이 바로 await)"""
     return als_service
 
+# GET /recommendations 요청을 모아서 처리하는 micro-batcher
+recommendation_batcher = RecommendationBatcher(get_als_service)
+
 @router.get("/test")
-async def test_endpoint():
+async def test_endpoint(als: Optional[ALSRecommendationService] = Depends(get_als_service)):
     """테스트 엔드포인트"""
-    als = get_als_service()
     model_status = "loaded" if als and als.is_loaded else "not_loaded"
     return {
         "message": "추천 서비스가 정상 작동 중입니다!", 
@@ -54,62 +88,49 @@ async def test_endpoint():
 async def get_recommendations(
     userId: int = Query(..., description="사용자 ID"),
     type: str = Query(..., description="추천 타입 (log, place, plan)"),
-    limit: int = Query(default=10, ge=1, le=50, description="추천 개수")
+    limit: int = Query(default=10, ge=1, le=50, description="추천 개수"),
+    als: Optional[ALSRecommendationService] = Depends(get_als_service)
 ):
     """백엔드 API 스펙용 추천 조회 (GET 방식)"""
     try:
         logger.info(f"백엔드 API 추천 요청: userId={userId}, type={type}, limit={limit}")
         
         # type 매핑 (log -> record)
-        type_mapping = {
-            "log": RecommendationType.RECORD,
-            "place": RecommendationType.PLACE,
-            "plan": RecommendationType.PLAN
-        }
-        
-        if type not in type_mapping:
+        rec_type = TYPE_MAPPING.get(type)
+        if rec_type is None:
             raise HTTPException(status_code=400, detail=f"지원하지 않는 타입: {type}")
         
-        rec_type = type_mapping[type]
-        
-        # ALS 서비스로 추천 생성
-        als = get_als_service()
+        # 캐시 확인 (모델 refresh / 배치 완료 시 무효화)
+        cache = get_recommendation_cache()
+        cache_key = ("simple", userId, rec_type.value, limit)
+        cache_version = cache.snapshot_version()
+        simple_recommendations = cache.get(cache_key, cache_version)
         
-        if als and als.is_loaded:
-            recommendations, algorithm_used = als.get_recommendations(
-                user_id=userId,
-                rec_type=rec_type,
-                limit=limit
-            )
-            logger.info(f"✅ ALS 추천 생성: {len(recommendations)}개")
+        if simple_recommendations is not None:
+            logger.info(f"⚡ 캐시된 추천 반환: userId={userId}, type={type}")
         else:
-            # ALS 모델 실패 시 백업: 인기도 기반
-            logger.warning("⚠️ ALS 모델 사용 불가 - 인기도 기반으로 백업")
-            db = DatabaseService()
-            popular_items = db.get_popular_items(rec_type.value, limit * 2)
-            selected_items = popular_items[:limit]
-            
-            recommendations = []
-            for i, item_id in enumerate(selected_items):
-                score = max(0.1, 1.0 - (i * 0.1))
-                recommendations.append(
-                    RecommendationItem(
-                        item_id=item_id,
-                        score=score,
-                        item_type=rec_type
-                    )
-                )
-        
-        # 백엔드 API 스펙에 맞게 변환
-        simple_recommendations = [
-            SimpleRecommendationItem(
-                itemId=rec.item_id,
-                score=rec.score
-            )
-            for rec in recommendations
-        ]
-        
-        response = SimpleRecommendationResponse(
+            # ALS 서비스로 추천 생성 ((item_id, score) 목록만 받아 RecommendationItem 생성 생략)
+            if als and als.is_loaded:
+                pairs = await recommendation_batcher.submit(userId, rec_type, limit)
+                logger.info(f"✅ ALS 추천 생성: {len(pairs)}개")
+            else:
+                # ALS 모델 실패 시 백업: 인기도 기반
+                logger.warning("⚠️ ALS 모델 사용 불가 - 인기도 기반으로 백업")
+                db = get_database_service()
+                popular_items = await db.get_popular_items_async(rec_type.value, limit * 2)
+                selected_items = popular_items[:limit]
+                pairs = list(zip(map(int, selected_items), rank_scores(len(selected_items)).tolist()))
+        
+            # 백엔드 API 스펙에 맞게 변환
+            # (item_id는 int, score는 0~1로 정규화된 float이 보장되므로 검증 생략)
+            simple_recommendations = [
+                SimpleRecommendationItem.model_construct(itemId=item_id, score=score)
+                for item_id, score in pairs
+            ]
+        
+            cache.set(cache_key, simple_recommendations, cache_version)
+        
+        response = SimpleRecommendationResponse.model_construct(
             userId=userId,
             itemType=type,  # 원래 요청한 타입 그대로 반환
             recommendations=simple_recommendations
@@ -122,27 +143,40 @@ async def get_recommendations(
         logger.error(f"백엔드 API 추천 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"추천 생성 실패: {str(e)}")
 
+async def _swap_als_service(als: ALSRecommendationService, mode: str) -> ALSRecommendationService:
+    """갱신된 ALS 서비스 사본을 스레드풀에서 구성한 뒤 전역 인스턴스를 원자적으로 교체
+    
+    진행 중인 요청은 이미 받은 이전 인스턴스를 끝까지 사용한다.
+    """
+    global als_service
+    async with _refresh_lock:
+        # 대기 중 다른 refresh가 교체했다면 최신 인스턴스 기준으로 구성
+        base = als_service or als
+        new_als = await run_in_threadpool(base.rebuilt_copy, mode)
+        als_service = new_als
+    return new_als
+
 @router.post("/recommendations/refresh", response_model=RefreshResponse)
-async def refresh_recommendations(request: RefreshRequest):
+async def refresh_recommendations(
+    request: RefreshRequest,
+    als: Optional[ALSRecommendationService] = Depends(get_als_service)
+):
     """모델 업데이트 / 추천 업데이트"""
     try:
         start_time = time.time()
         logger.info(f"추천 업데이트 시작: mode={request.mode}")
         
-        als = get_als_service()
-        
         if request.mode == "full":
             # 전체 업데이트
             if als and als.is_loaded:
-                # 현재 데이터베이스에서 모든 사용자의 상호작용 데이터 재로드
-                als._rebuild_mappings()
-                als._load_item_metadata()
-                updated_count = len(als.user_id_map) + len(als.item_id_map)
-                logger.info(f"✅ 전체 업데이트 완료: 사용자 {len(als.user_id_map)}명, 아이템 {len(als.item_id_map)}개")
+                # 현재 데이터베이스에서 모든 사용자의 상호작용 데이터 재로드 (별도 사본에 구성 후 교체)
+                new_als = await _swap_als_service(als, "full")
+                updated_count = len(new_als.user_id_map) + len(new_als.item_id_map)
+                logger.info(f"✅ 전체 업데이트 완료: 사용자 {len(new_als.user_id_map)}명, 아이템 {len(new_als.item_id_map)}개")
             else:
                 # ALS 모델이 없으면 데이터베이스만 업데이트
-                db = DatabaseService()
-                interactions = db.get_user_item_interactions()
+                db = get_database_service()
+                interactions = await db.get_user_item_interactions_async()
                 updated_count = len(interactions)
                 logger.info(f"✅ 데이터베이스 업데이트 완료: {updated_count}건")
                 
@@ -150,13 +184,16 @@ async def refresh_recommendations(request: RefreshRequest):
             # 증분 업데이트 (간단 구현)
             if als and als.is_loaded:
                 # 메타데이터만 업데이트
-                als._load_item_metadata()
-                updated_count = len(als.item_metadata)
+                new_als = await _swap_als_service(als, "incremental")
+                updated_count = len(new_als.item_metadata)
                 logger.info(f"✅ 증분 업데이트 완료: 메타데이터 {updated_count}개")
             else:
                 updated_count = 0
                 logger.warning("⚠️ ALS 모델이 로드되지 않아 증분 업데이트 불가")
         
+        # 갱신된 매핑/메타데이터 기준으로 다시 계산되도록 캐시 무효화
+        get_recommendation_cache().invalidate()
+        
         duration = time.time() - start_time
         
         response = RefreshResponse(
@@ -173,16 +210,15 @@ async def refresh_recommendations(request: RefreshRequest):
         raise HTTPException(status_code=500, detail=f"업데이트 실패: {str(e)}")
 
 @router.get("/database/test")
-async def test_database():
+async def test_database(als: Optional[ALSRecommendationService] = Depends(get_als_service)):
     """데이터베이스 연결 테스트"""
     try:
-        db = DatabaseService()
-        interactions = db.get_user_item_interactions()
-        popular = db.get_popular_items("record", 3)
-        metadata = db.get_item_metadata(popular[:2])
+        db = get_database_service()
+        interactions = await db.get_user_item_interactions_async()
+        popular = await db.get_popular_items_async("record", 3)
+        metadata = await db.get_item_metadata_async(popular[:2])
         
         # ALS 모델 상태도 확인
-        als = get_als_service()
         model_info = als.get_model_info() if als and als.is_loaded else {"status": "not_loaded"}
         
         return {
@@ -198,67 +234,107 @@ async def test_database():
 
 # 기존 API (호환성 유지)
 @router.post("/recommendations", response_model=RecommendationResponse)
-async def create_recommendations(request: RecommendationRequest):
-    """통합 추천 API (ALS 모델 기반) - 기존 호환성용"""
+async def create_recommendations(
+    request: RecommendationRequest,
+    als: Optional[ALSRecommendationService] = Depends(get_als_service),
+    accept: Optional[str] = Header(default=None)
+):
+    """통합 추천 API (ALS 모델 기반) - 기존 호환성용
+    
+    Accept: application/x-ndjson 요청 시 첫 줄에 요약, 이후 한 줄에 추천 아이템 하나씩 스트리밍
+    """
     try:
         logger.info(f"ALS 추천 요청: user_id={request.user_id}, type={request.recommendation_type}")
         
-        # ALS 서비스 가져오기
-        als = get_als_service()
-        
-        if als and als.is_loaded:
-            # ALS 모델 사용
-            recommendations, algorithm_used = als.get_recommendations(
-            user_id=request.user_id,
-            rec_type=request.recommendation_type,
-            limit=request.limit,
-            filters=request.filters,
-            exclude_items=request.exclude_items
+        # 제외 목록은 한 번만 중복 제거 (캐시 키와 추천 서비스에 같은 집합 사용)
+        exclude_set = frozenset(request.exclude_items or ())
+        
+        # 캐시 확인 (제외 목록은 정렬, 필터는 키 정렬 JSON으로 정규화해 키에 포함)
+        cache = get_recommendation_cache()
+        cache_key = (
+            "full",
+            request.user_id,
+            request.recommendation_type.value,
+            request.limit,
+            tuple(sorted(exclude_set)),
+            orjson.dumps(request.filters, option=orjson.OPT_SORT_KEYS) if request.filters else b""
         )
-            logger.info(f"✅ ALS 모델로 추천 생성: {len(recommendations)}개")
-            
+        cache_version = cache.snapshot_version()
+        cached = cache.get(cache_key, cache_version)
+        
+        if cached is not None:
+            recommendations, algorithm_used = cached
+            logger.info(f"⚡ 캐시된 추천 반환: user_id={request.user_id}")
         else:
-            # ALS 모델 로딩 실패 시 백업: 인기도 기반
-            logger.warning("⚠️ ALS 모델 사용 불가 - 인기도 기반으로 백업")
-            db = DatabaseService()
-            popular_items = db.get_popular_items(request.recommendation_type.value, request.limit * 2)
+            if als and als.is_loaded:
+                # ALS 모델 사용 (NumPy 연산이 이벤트 루프를 막지 않도록 스레드풀에서 실행)
+                recommendations, algorithm_used = await run_in_threadpool(
+                    als.get_recommendations,
+                    user_id=request.user_id,
+                    rec_type=request.recommendation_type,
+                    limit=request.limit,
+                    filters=request.filters,
+                    exclude_items=exclude_set
+                )
+                logger.info(f"✅ ALS 모델로 추천 생성: {len(recommendations)}개")
+            
+            else:
+                # ALS 모델 로딩 실패 시 백업: 인기도 기반
+                logger.warning("⚠️ ALS 모델 사용 불가 - 인기도 기반으로 백업")
+                db = get_database_service()
+                popular_items = await db.get_popular_items_async(request.recommendation_type.value, request.limit * 2)
             
-            if request.exclude_items:
-                popular_items = [item for item in popular_items if item not in request.exclude_items]
+                if exclude_set:
+                    popular_items = [item for item in popular_items if item not in exclude_set]
             
-            selected_items = popular_items[:request.limit]
-            metadata_dict = db.get_item_metadata(selected_items)
+                selected_items = popular_items[:request.limit]
+                metadata_dict = await db.get_item_metadata_async(selected_items)
             
-            recommendations = []
-            for i, item_id in enumerate(selected_items):
-                metadata = metadata_dict.get(str(item_id), {})
-                score = max(0.1, 1.0 - (i * 0.1))
+                # 아이템별 메타데이터/extra를 한 번씩만 조회하고 순위 점수는 벡터로 계산
+                rec_type = request.recommendation_type
+                rows = []
+                for item_id in selected_items:
+                    metadata = metadata_dict.get(str(item_id), {})
+                    rows.append((item_id, metadata, metadata.get("extra", {})))
+                scores = rank_scores(len(rows)).tolist()
                 
-                recommendations.append(
-                    RecommendationItem(
-                        item_id=item_id,
+                recommendations = [
+                    RecommendationItem.model_construct(
+                        item_id=int(item_id),
                         score=score,
-                        item_type=request.recommendation_type,
+                        item_type=rec_type,
                         title=metadata.get("title", f"아이템 {item_id}"),
                         description=metadata.get("description", ""),
                         metadata={
                             "method": "popularity_fallback",
-                            "rank": i + 1,
+                            "rank": rank,
                             "author_name": metadata.get("author_name"),
                             "author_nickname": metadata.get("author_nickname"),
-                            "like_count": metadata.get("extra", {}).get("like_count", 0),
-                            "comment_count": metadata.get("extra", {}).get("comment_count", 0)
+                            "like_count": extra.get("like_count", 0),
+                            "comment_count": extra.get("comment_count", 0)
                         }
                     )
-                )
-            algorithm_used = "popularity_fallback"
+                    for rank, ((item_id, metadata, extra), score) in enumerate(zip(rows, scores), start=1)
+                ]
+                algorithm_used = "popularity_fallback"
+        
+            cache.set(cache_key, (recommendations, algorithm_used), cache_version)
+        
+        generated_at = datetime.now().isoformat()
+        
+        if accept and NDJSON_MEDIA_TYPE in accept:
+            logger.info(f"추천 스트리밍 시작: {len(recommendations)}개 아이템 (알고리즘: {algorithm_used})")
+            return StreamingResponse(
+                _stream_recommendations(request.user_id, recommendations, algorithm_used, generated_at),
+                media_type=NDJSON_MEDIA_TYPE
+            )
         
-        response = RecommendationResponse(
+        response = RecommendationResponse.model_construct(
             user_id=request.user_id,
             recommendations=recommendations,
             total_count=len(recommendations),
             algorithm_used=algorithm_used,
-            generated_at=datetime.now().isoformat()
+            generated_at=generated_at
         )
         
         logger.info(f"추천 생성 완료: {len(recommendations)}개 아이템 (알고리즘: {algorithm_used})")
@@ -268,17 +344,35 @@ async def create_recommendations(request: RecommendationRequest):
         logger.error(f"추천 생성 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"추천 생성 실패: {str(e)}")
 
+async def _stream_recommendations(
+    user_id: int,
+    recommendations: List[RecommendationItem],
+    algorithm_used: str,
+    generated_at: str
+):
+    """NDJSON 스트림 생성 (요약 한 줄 + 아이템별 한 줄)"""
+    yield orjson.dumps({
+        "user_id": user_id,
+        "total_count": len(recommendations),
+        "algorithm_used": algorithm_used,
+        "generated_at": generated_at
+    }) + b"\n"
+    for rec in recommendations:
+        yield orjson.dumps(rec.model_dump()) + b"\n"
+
 @router.get("/recommendations/records/{user_id}", response_model=RecommendationResponse)
 async def get_record_recommendations(
     user_id: int, 
     limit: int = 10,
-    exclude_items: str = None
+    exclude_items: str = None,
+    als: Optional[ALSRecommendationService] = Depends(get_als_service)
 ):
     """기록 추천 전용 API"""
     exclude_list = []
     if exclude_items:
         try:
-            exclude_list = [int(x.strip()) for x in exclude_items.split(",")]
+            # int()는 앞뒤 공백을 허용하므로 별도 strip 불필요
+            exclude_list = list(map(int, exclude_items.split(",")))
         except ValueError:
             raise HTTPException(status_code=400, detail="exclude_items 형식이 올바르지 않습니다")
     
@@ -288,12 +382,11 @@ async def get_record_recommendations(
         limit=limit,
         exclude_items=exclude_list
     )
-    return await create_recommendations(request)
+    return await create_recommendations(request, als=als, accept=None)
 
 @router.get("/model/info")
-async def get_model_info():
+async def get_model_info(als: Optional[ALSRecommendationService] = Depends(get_als_service)):
     """ALS 모델 정보 조회"""
-    als = get_als_service()
     if als and als.is_loaded:
         return als.get_model_info()
     else:
@@ -301,41 +394,80 @@ async def get_model_info():
 
 # ===== 배치 처리 API =====
 
+# 수동 배치 전용 프로세스 풀 (배치 연산이 API 이벤트 루프/GIL을 점유하지 않도록 분리)
+batch_executor: Optional[ProcessPoolExecutor] = None
+
+# 수동 배치 작업 상태 (batch_id -> 상태)
+MAX_BATCH_TASKS = 100
+batch_tasks: Dict[str, Dict[str, Any]] = {}
+
+def get_batch_executor() -> ProcessPoolExecutor:
+    """배치 프로세스 풀 반환 (최초 호출 시 생성)"""
+    global batch_executor
+    if batch_executor is None:
+        # uvicorn 프로세스의 스레드/이벤트 루프 상태를 물려받지 않도록 spawn 사용
+        batch_executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return batch_executor
+
+def shutdown_batch_executor():
+    """배치 프로세스 풀 종료 (애플리케이션 종료 시)"""
+    global batch_executor
+    if batch_executor is not None:
+        batch_executor.shutdown(wait=False, cancel_futures=True)
+        batch_executor = None
+
 @router.post("/batch/trigger")
 async def trigger_batch(
     batch_type: str = Query(default="incremental", description="배치 타입: full 또는 incremental"),
     user_limit: int = Query(default=None, description="처리할 최대 사용자 수 (full batch 전용)")
 ):
     """수동 배치 처리 트리거 (비동기 실행)"""
-    if batch_type not in ["full", "incremental"]:
+    if batch_type not in BATCH_TYPES:
         raise HTTPException(status_code=400, detail="batch_type은 'full' 또는 'incremental'이어야 합니다")
     
     try:
-        from app.services.batch_service import BatchService
-        import asyncio
-        
-        batch_service = BatchService()
-        
-        # 배치 처리를 백그라운드에서 비동기 실행
-        async def run_batch_background():
-            if batch_type == "full":
-                if user_limit:
-                    # 사용자 수 제한된 배치
-                    success = await batch_service.run_mini_batch(user_limit)
-                else:
-                    # 전체 배치
-                    success = await batch_service.run_full_batch()
-            else:
-                success = await batch_service.run_incremental_batch()
+        batch_id = uuid.uuid4().hex[:12]
+        batch_tasks[batch_id] = {
+            "batch_id": batch_id,
+            "batch_type": batch_type,
+            "user_limit": user_limit,
+            "status": "running",
+            "started_at": datetime.now().isoformat(),
+            "finished_at": None
+        }
+        # 오래된 작업 상태는 최근 MAX_BATCH_TASKS개만 유지
+        while len(batch_tasks) > MAX_BATCH_TASKS:
+            batch_tasks.pop(next(iter(batch_tasks)))
+        
+        # 배치 처리를 별도 프로세스에서 실행 (API 이벤트 루프와 분리)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(get_batch_executor(), run_batch_job, batch_type, user_limit)
+        
+        def on_batch_done(fut):
+            task = batch_tasks.get(batch_id, {})
+            try:
+                success, records = fut.result()
+                # 워커 프로세스에서 기록된 배치 결과를 API 프로세스 이력에 반영
+                extend_batch_history(records)
+            except Exception as e:
+                success = False
+                task["error"] = str(e)
+            task["status"] = "completed" if success else "failed"
+            task["finished_at"] = datetime.now().isoformat()
             
-            logger.info(f"🎯 백그라운드 배치 완료: {batch_type}, 성공: {success}")
+            if success:
+                get_recommendation_cache().invalidate()
+            logger.info(f"🎯 백그라운드 배치 완료: {batch_type} ({batch_id}), 성공: {success}")
         
-        # 백그라운드 태스크 시작
-        asyncio.create_task(run_batch_background())
+        future.add_done_callback(on_batch_done)
         
         # 즉시 응답 반환
         return {
             "message": f"{batch_type} 배치 처리가 백그라운드에서 시작되었습니다",
+            "batch_id": batch_id,
             "batch_type": batch_type,
             "user_limit": user_limit,
             "status": "started",
@@ -346,87 +478,35 @@ async def trigger_batch(
         logger.error(f"❌ 배치 처리 시작 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"배치 처리 시작 중 오류가 발생했습니다: {str(e)}")
 
+# 배치 상태 폴링 대응용 짧은 TTL 캐시
+BATCH_STATUS_CACHE_TTL = 1.0
+_batch_status_cache = {"expires_at": 0.0, "value": None}
+
 @router.get("/batch/status")
 async def get_batch_status():
-    """최근 배치 처리 상태 조회 (파일 로그 기반)"""
+    """최근 배치 처리 상태 조회 (메모리 이력 기반, 파일 로그는 최초 1회만 읽음)"""
+    now = time.monotonic()
+    if _batch_status_cache["value"] is not None and now < _batch_status_cache["expires_at"]:
+        return _batch_status_cache["value"]
+    
     try:
-        import os
-        from datetime import datetime
+        batch_logs = get_batch_history(10)
         
-        log_file = "/app/logs/batch.log"
-        batch_logs = []
-        
-        # 파일 로그가 존재하는지 확인
-        if os.path.exists(log_file):
-            try:
-                with open(log_file, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                
-                # 최근 10개 로그만 파싱
-                recent_lines = lines[-10:] if len(lines) >= 10 else lines
-                
-                for line in recent_lines:
-                    if line.strip():
-                        try:
-                            # 로그 형식: [2024-01-08 14:30:00] FULL BATCH - Status: completed, Users: 50, Recommendations: 500
-                            parts = line.strip().split(" - ")
-                            if len(parts) >= 2:
-                                timestamp_part = parts[0].replace("[", "").replace("]", "")
-                                batch_type = timestamp_part.split()[-2] if "BATCH" in timestamp_part else "unknown"
-                                
-                                status_info = parts[1]
-                                status = "completed" if "completed" in status_info else ("failed" if "failed" in status_info else "unknown")
-                                
-                                # Users, Recommendations 숫자 추출
-                                users = 0
-                                recommendations = 0
-                                if "Users:" in status_info:
-                                    try:
-                                        users_part = status_info.split("Users:")[1].split(",")[0].strip()
-                                        users = int(users_part)
-                                    except:
-                                        users = 0
-                                
-                                if "Recommendations:" in status_info:
-                                    try:
-                                        rec_part = status_info.split("Recommendations:")[1].split(",")[0].strip()
-                                        recommendations = int(rec_part)
-                                    except:
-                                        recommendations = 0
-                                
-                                batch_logs.append({
-                                    "batch_type": batch_type.lower(),
-                                    "timestamp": timestamp_part.split("]")[0].replace("[", ""),
-                                    "status": status,
-                                    "processed_users": users,
-                                    "total_recommendations": recommendations,
-                                    "source": "file_log"
-                                })
-                        except Exception as e:
-                            logger.warning(f"로그 라인 파싱 실패: {line.strip()}, 오류: {str(e)}")
-                            continue
-                            
-            except Exception as e:
-                logger.error(f"배치 로그 파일 읽기 실패: {str(e)}")
-                
-        # 최신 순으로 정렬
-        batch_logs.reverse()
-        
-        # 메모리에서 현재 실행 중인 배치 정보도 포함 (간단 구현)
         current_status = {
-            "message": f"배치 로그 파일에서 {len(batch_logs)}개의 기록을 발견했습니다" if batch_logs else "배치 실행 기록이 없습니다",
-            "log_file_path": log_file,
-            "log_file_exists": os.path.exists(log_file),
-            "recent_batches": batch_logs
+            "message": f"최근 배치 기록 {len(batch_logs)}개를 찾았습니다" if batch_logs else "배치 실행 기록이 없습니다",
+            "log_file_path": BATCH_LOG_FILE,
+            "recent_batches": batch_logs,
+            "triggered_batches": list(reversed(batch_tasks.values()))
         }
         
+        _batch_status_cache["value"] = current_status
+        _batch_status_cache["expires_at"] = now + BATCH_STATUS_CACHE_TTL
         return current_status
         
     except Exception as e:
         logger.error(f"❌ 배치 상태 조회 실패: {str(e)}")
         return {
             "message": f"배치 상태 조회 중 오류 발생: {str(e)}",
-            "log_file_path": "/app/logs/batch.log", 
-            "log_file_exists": False,
+            "log_file_path": BATCH_LOG_FILE,
             "recent_batches": []
-        } 
\ No newline at end of file
+        }
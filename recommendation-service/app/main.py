@@ -1,13 +1,22 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+import anyio.to_thread
+import asyncio
+import os
 import time
 import uvicorn
 from contextlib import asynccontextmanager
 
-from app.api.recommendation import router as recommendation_router
+from app.api.recommendation import (
+    router as recommendation_router,
+    recommendation_batcher,
+    init_als_service,
+    shutdown_batch_executor
+)
 from app.models.schemas import HealthResponse
-from app.services.als_service import ALSRecommendationService
+from app.services.database_service import dispose_async_engine
+from app.utils.config import get_settings
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,25 +31,31 @@ als_service = None
 async def lifespan(app: FastAPI):
     # 시작 시 실행
     logger.info("🚀 추천 서비스 시작")
+    # run_in_threadpool로 넘기는 ALS 연산/동기 DB 작업용 스레드 수 (anyio 기본값 40)
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = get_settings().get('performance.threadpool_size', 100)
     global als_service
-    try:
-        als_service = ALSRecommendationService()
-        if als_service.is_loaded:
-            logger.info("✅ ALS 모델 로딩 완료")
-        else:
-            logger.warning("⚠️ ALS 모델 로딩 실패")
-    except Exception as e:
-        logger.error(f"❌ ALS 서비스 초기화 실패: {str(e)}")
-        als_service = None
+    # 라우터와 같은 인스턴스를 공유 (요청 처리 중 모델 로딩 비용 없음)
+    # 파일 I/O가 이벤트 루프를 막지 않도록 워커 스레드에서 로딩
+    als_service = await asyncio.to_thread(init_als_service)
+    if als_service is not None:
+        logger.info("✅ ALS 모델 로딩 완료")
+    else:
+        logger.warning("⚠️ ALS 모델 로딩 실패")
+    recommendation_batcher.start()
     yield
     # 종료 시 실행  
+    await recommendation_batcher.stop()
+    shutdown_batch_executor()
+    await dispose_async_engine()
     logger.info("🛑 추천 서비스 종료")
 
 app = FastAPI(
     title="Travel Recommendation Service",
     description="여행ON나 AI 추천 시스템",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # 응답 직렬화를 orjson으로 (stdlib json 대비 빠름)
 )
 
 # CORS 설정
@@ -110,5 +125,9 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=False,  # 운영환경에서는 False
+        loop="uvloop",
+        http="httptools",
+        # 기본 1개 - refresh/캐시 무효화/배치 상태는 프로세스 메모리에 있어 여러 워커는 UVICORN_WORKERS로 명시할 때만
+        workers=int(os.getenv("UVICORN_WORKERS", 1)),
         log_level="info"
     ) 
\ No newline at end of file
@@ -0,0 +1,228 @@
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+# 점수 계산/마스킹/top-k JIT 컴파일 (선택) - numba가 없으면 NumPy 경로 사용
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# int8 근사 점수로 뽑는 후보 수 배율 (후보는 float32 정확 점수로 다시 정렬)
+QUANTIZED_OVERSAMPLE = 4
+
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """값이 큰 순서대로 상위 k개 인덱스 반환 (argpartition O(N) + k개만 정렬)"""
+    k = min(k, values.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    candidates = np.argpartition(values, -k)[-k:]
+    return candidates[np.argsort(values[candidates])[::-1]]
+
+if njit is not None:
+    @njit(cache=True)
+    def _heap_replace_min(top_scores, top_indices, score, index):
+        """최소 힙 루트(현재 k번째 점수)를 새 항목으로 교체 후 sift-down - O(log k)
+
+        top_scores[0]이 항상 유지 중인 상위 k개의 최솟값이므로 후보 비교는 루트 하나와만 한다.
+        """
+        k = top_scores.shape[0]
+        pos = 0
+        while True:
+            child = 2 * pos + 1
+            if child >= k:
+                break
+            if child + 1 < k and top_scores[child + 1] < top_scores[child]:
+                child += 1
+            if top_scores[child] >= score:
+                break
+            top_scores[pos] = top_scores[child]
+            top_indices[pos] = top_indices[child]
+            pos = child
+        top_scores[pos] = score
+        top_indices[pos] = index
+
+    @njit(cache=True)
+    def _masked_top_k_kernel(scores, masked, k):
+        """마스킹 + 상위 k개 선택을 점수 배열 한 번 순회로 처리 (임시 배열 복사 없음)"""
+        is_masked = np.zeros(scores.shape[0], dtype=np.uint8)
+        for i in range(masked.shape[0]):
+            is_masked[masked[i]] = 1
+
+        top_scores = np.full(k, -np.inf, dtype=np.float64)
+        top_indices = np.full(k, -1, dtype=np.int64)
+
+        for i in range(scores.shape[0]):
+            score = scores[i]
+            if is_masked[i] or score <= top_scores[0]:
+                continue
+            _heap_replace_min(top_scores, top_indices, score, i)
+
+        order = np.argsort(-top_scores)
+        result = top_indices[order]
+        return result[result >= 0]
+
+    @njit(inline='always', fastmath=True)
+    def _score_top_k_body(user_factor, item_factors, excluded, k, n_factors):
+        """내적 계산 + 제외 아이템 건너뛰기 + 상위 k개 선택을 아이템 한 번 순회로 처리 (커널 공통 본체)
+
+        excluded는 정렬된 인덱스 배열 (아이템 순서대로 포인터만 전진, 전체 점수 벡터 할당 없음).
+        호출 커널에 인라인되므로 n_factors가 컴파일 타임 상수이면 내적 루프가 그대로 펼쳐진다.
+        """
+        top_scores = np.full(k, -np.inf, dtype=np.float64)
+        top_indices = np.full(k, -1, dtype=np.int64)
+        next_excluded = 0
+
+        for i in range(item_factors.shape[0]):
+            while next_excluded < excluded.shape[0] and excluded[next_excluded] < i:
+                next_excluded += 1
+            if next_excluded < excluded.shape[0] and excluded[next_excluded] == i:
+                continue
+
+            # 팩터와 같은 float32로 누적 (float64 승격 없이 SIMD 레인 2배)
+            score = np.float32(0.0)
+            for f in range(n_factors):
+                score += item_factors[i, f] * user_factor[f]
+            if score <= top_scores[0]:
+                continue
+            _heap_replace_min(top_scores, top_indices, score, i)
+
+        order = np.argsort(-top_scores)
+        valid = top_indices[order] >= 0
+        return top_indices[order][valid], top_scores[order][valid]
+
+    @njit(cache=True, fastmath=True)
+    def _score_top_k_kernel(user_factor, item_factors, excluded, k):
+        """범용 점수 계산 + top-k 커널 (팩터 수는 런타임 값)"""
+        return _score_top_k_body(user_factor, item_factors, excluded, k, item_factors.shape[1])
+
+    def _make_score_top_k_kernel(n_factors: int):
+        """팩터 수를 컴파일 타임 상수로 고정한 _score_top_k_kernel 생성
+
+        내부 내적 루프 길이가 상수이므로 LLVM이 완전히 펼치고 사용자 팩터를 레지스터에 유지한다.
+        (클로저 상수에 의존하므로 디스크 캐시 없이 프로세스당 한 번 컴파일)
+        """
+        @njit(fastmath=True)
+        def kernel(user_factor, item_factors, excluded, k):
+            return _score_top_k_body(user_factor, item_factors, excluded, k, n_factors)
+
+        return kernel
+
+    @njit(cache=True)
+    def _quantized_top_k_kernel(user_q, item_q, item_scales, excluded, k):
+        """int8 팩터 내적(int32 누적) x 아이템 행 scale로 근사 점수 상위 k개 선택 (excluded는 정렬된 인덱스)
+
+        사용자 scale은 모든 아이템에 같은 양수이므로 순위에 영향이 없어 곱하지 않는다.
+        """
+        top_scores = np.full(k, -np.inf, dtype=np.float64)
+        top_indices = np.full(k, -1, dtype=np.int64)
+        next_excluded = 0
+
+        for i in range(item_q.shape[0]):
+            while next_excluded < excluded.shape[0] and excluded[next_excluded] < i:
+                next_excluded += 1
+            if next_excluded < excluded.shape[0] and excluded[next_excluded] == i:
+                continue
+
+            acc = np.int32(0)
+            for f in range(item_q.shape[1]):
+                acc += np.int32(item_q[i, f]) * np.int32(user_q[f])
+            score = acc * item_scales[i]
+            if score <= top_scores[0]:
+                continue
+            _heap_replace_min(top_scores, top_indices, score, i)
+
+        valid = top_indices >= 0
+        return top_indices[valid]
+else:
+    _masked_top_k_kernel = None
+    _score_top_k_kernel = None
+    _make_score_top_k_kernel = None
+    _quantized_top_k_kernel = None
+
+# 팩터 수별 특화 커널 (모델 재로딩/서비스 사본 간 공유)
+_SPECIALIZED_KERNELS: Dict[int, Callable] = {}
+
+# 단일 사용자 점수 계산까지 JIT 커널로 처리할 수 있는지 여부
+SCORE_KERNEL_AVAILABLE = _score_top_k_kernel is not None
+
+def masked_top_k(scores: np.ndarray, masked: np.ndarray, k: int) -> np.ndarray:
+    """masked 인덱스를 제외한 상위 k개 인덱스를 점수 내림차순으로 반환"""
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if _masked_top_k_kernel is not None:
+        return _masked_top_k_kernel(np.ascontiguousarray(scores), masked, k)
+
+    # numba가 없으면 NumPy로 처리 (마스킹으로 원본이 바뀌지 않도록 복사)
+    scores = np.array(scores, copy=True)
+    scores[masked] = -np.inf
+    top_items = top_k_indices(scores, k)
+    return top_items[scores[top_items] > -np.inf]
+
+def quantize_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """행별 대칭 int8 양자화 → (int8 행렬, 행별 float32 scale) (scale = 행 절댓값 최대 / 127)"""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+    return np.ascontiguousarray(quantized), scales.astype(np.float32)
+
+def specialized_score_kernel(n_factors: int) -> Optional[Callable]:
+    """팩터 수에 특화된 점수 계산 + top-k 커널 (numba가 없으면 None)"""
+    if _make_score_top_k_kernel is None:
+        return None
+    kernel = _SPECIALIZED_KERNELS.get(n_factors)
+    if kernel is None:
+        kernel = _SPECIALIZED_KERNELS[n_factors] = _make_score_top_k_kernel(n_factors)
+    return kernel
+
+def score_top_k(
+    user_factor: np.ndarray,
+    item_factors: np.ndarray,
+    excluded: np.ndarray,
+    k: int,
+    kernel: Optional[Callable] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """사용자 팩터 기준 상위 k개 (아이템 인덱스, 점수) - excluded 인덱스 제외, 점수 내림차순
+
+    kernel: specialized_score_kernel()로 만든 팩터 수 특화 커널 (없으면 범용 커널)
+    """
+    excluded = np.unique(excluded).astype(np.int64)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    kernel = kernel or _score_top_k_kernel
+    if kernel is not None:
+        # memmap 등 ndarray 하위 클래스는 기본 ndarray 뷰로 전달 (복사 없음)
+        return kernel(
+            np.asarray(user_factor), np.ascontiguousarray(item_factors), excluded, k
+        )
+
+    scores = item_factors @ user_factor
+    top_items = masked_top_k(scores, excluded, k)
+    return top_items, scores[top_items]
+
+def quantized_score_top_k(
+    user_factor: np.ndarray,
+    item_factors: np.ndarray,
+    item_q: np.ndarray,
+    item_scales: np.ndarray,
+    excluded: np.ndarray,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """int8 근사 점수로 후보 k * QUANTIZED_OVERSAMPLE개 선택 후 float32 정확 점수로 상위 k개 (score_top_k와 같은 반환)
+
+    아이템 팩터를 int8(float32의 1/4)로 읽어 메모리 대역폭을 줄이고, 반환 점수/순서는 정확한 내적 기준이다.
+    """
+    if _quantized_top_k_kernel is None:
+        return score_top_k(user_factor, item_factors, excluded, k)
+
+    excluded = np.unique(excluded).astype(np.int64)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    user_q, _ = quantize_rows(user_factor)
+    candidates = _quantized_top_k_kernel(user_q[0], item_q, item_scales, excluded, k * QUANTIZED_OVERSAMPLE)
+
+    exact = np.asarray(item_factors[candidates] @ np.asarray(user_factor), dtype=np.float64)
+    order = top_k_indices(exact, k)
+    return candidates[order], exact[order]
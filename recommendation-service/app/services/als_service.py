@@ -1,28 +1,128 @@
+import copy
+import json
+import os
 import pickle
+import threading
+import time
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Collection, List, Dict, Optional, Tuple
 import logging
 from scipy.sparse import csr_matrix
 from app.models.schemas import RecommendationItem, RecommendationType
+from app.utils.config import get_settings
 from app.utils.logger import get_logger
-from app.services.database_service import DatabaseService
+from app.services.database_service import get_database_service
+from app.services._als_kernels import (
+    SCORE_KERNEL_AVAILABLE, masked_top_k, quantize_rows, quantized_score_top_k, score_top_k,
+    specialized_score_kernel, top_k_indices
+)
 
 logger = get_logger(__name__)
 
+# GPU 추론 (선택) - torch가 설치되어 있고 CUDA 사용 가능할 때만 활성화
+try:
+    import torch
+    GPU_AVAILABLE = torch.cuda.is_available()
+except ImportError:
+    torch = None
+    GPU_AVAILABLE = False
+
+# model.gpu_dtype 설정값 → torch dtype (bfloat16은 float32와 지수 범위가 같아 큰 팩터 값에도 안전)
+GPU_DTYPES = {
+    "float16": torch.float16,
+    "bfloat16": torch.bfloat16,
+    "float32": torch.float32
+} if torch is not None else {}
+
+# 순위 기반 인기도 점수 (1위 1.0부터 0.1씩 감소, 최소 0.1) - 최대 추천 개수(50)까지 미리 계산
+_RANK_SCORES = np.maximum(0.1, 1.0 - np.arange(51) * 0.1)
+
+def rank_scores(count: int) -> np.ndarray:
+    """상위 count개 순위의 인기도 점수 배열 반환"""
+    if count <= len(_RANK_SCORES):
+        return _RANK_SCORES[:count]
+    return np.maximum(0.1, 1.0 - np.arange(count) * 0.1)
+
+# 점수 계산 단계에서 후보 아이템으로 반영하는 필터 속성
+FILTER_ATTRIBUTES = ("category", "region")
+
+# 메타데이터가 없는 아이템용 공용 빈 dict (조회 실패 시마다 새 dict를 만들지 않도록, 수정 금지)
+_EMPTY_METADATA: Dict = {}
+
+# 피클에서 변환한 모델 아티팩트(.npy) 저장 디렉토리 이름 (model_path 하위)
+ARTIFACT_DIR_NAME = "artifacts"
+# 아티팩트 형식 버전 (저장 형식이 바뀌면 올려서 자동 재생성)
+ARTIFACT_VERSION = 2
+
+# DB 인기 아이템 조회 크기 (최대 추천 개수 50 x 3) - 한 번 크게 조회해 두고 요청 개수만큼 잘라 사용
+POPULAR_ITEMS_FETCH = 150
+
+# 미리 정렬해 둘 인기 아이템 후보 수 (limit + 제외 목록이 이보다 크면 전체에서 다시 선택)
+POPULAR_CANDIDATES = 1000
+
+def _as_lookup(values):
+    """필터 값 목록을 멤버십 검사용 집합으로 변환 (목록이 아니면 원래 값의 in 동작 유지)"""
+    if isinstance(values, (list, tuple, set, frozenset)):
+        try:
+            return frozenset(values)
+        except TypeError:
+            return values
+    return values
+
 class ALSRecommendationService:
     def __init__(self, model_path: str = "/app/models"):
         self.model_path = model_path
         self.model = None
         self.user_item_matrix = None
+        # user-item 행렬의 CSR 원시 배열 (사용자별 상호작용 아이템을 행 슬라이스 객체 없이 조회)
+        self._u_indptr = np.zeros(1, dtype=np.int64)
+        self._u_indices = np.empty(0, dtype=np.int32)
+        self._u_data = np.empty(0, dtype=np.float32)
         self.user_id_map = {}  # user_id -> matrix_index
         self.item_id_map = {}  # item_id -> matrix_index  
-        self.reverse_user_map = {}  # matrix_index -> user_id
-        self.reverse_item_map = {}  # matrix_index -> item_id
+        self.reverse_item_ids = np.empty(0, dtype=np.int64)  # matrix_index -> item_id (없으면 -1)
+        # item_id -> matrix_index 벡터화 조회용 (ID 오름차순 정렬 배열)
+        self.item_ids_sorted = np.empty(0, dtype=np.int64)
+        self.item_indices_sorted = np.empty(0, dtype=np.int64)
+        # user_id -> matrix_index 벡터화 조회용 (배치 추천에서 사용자 목록을 한 번에 변환)
+        self.user_ids_sorted = np.empty(0, dtype=np.int64)
+        self.user_indices_sorted = np.empty(0, dtype=np.int64)
         self.item_metadata = {}
+        # 필터 속성 값 → 아이템 인덱스 배열 (메타데이터 로딩 시 생성)
+        self.attribute_index = {key: {} for key in FILTER_ATTRIBUTES}
+        # 아이템 인기도 (user_item_matrix 열 합계, 로딩 시 한 번만 계산)
+        self.item_popularity = None
+        self.item_popularity_max = 0.0
+        self.popular_indices = np.empty(0, dtype=np.intp)
         self.is_loaded = False
-        self.db_service = DatabaseService()
+        # 로드한 모델 버전 (원본 피클 수정 시각) - 모델이 바뀌면 이전 배치 결과를 재사용하지 않음
+        self.model_version = 0.0
+        # 워커 프로세스 간 공유할 팩터 행렬(.npy) 저장 위치
+        self.factor_cache_dir = get_settings().get('model.factor_cache_dir', '/tmp/als_factors')
+        # GPU에 올린 팩터 텐서 (user_factors, item_factors) - GPU 없으면 None
+        self.gpu_factors = None
+        # GPU 팩터 저장 형식 (float16/bfloat16은 메모리 대역폭 절반, Tensor Core 사용)
+        self.gpu_dtype = get_settings().get('model.gpu_dtype', 'float16')
+        # 팩터 수 특화 점수 계산 커널 (numba 없으면 None → 범용 경로)
+        self._score_kernel = None
+        # 단일 사용자 점수 계산용 int8 아이템 팩터 (행렬, 행별 scale) - model.int8_scoring 설정 시에만 생성
+        self.int8_scoring = get_settings().get('model.int8_scoring', False)
+        self._quantized_item_factors: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        # YᵀY + λI (사용자 팩터 재계산용, 모델 로드당 한 번 계산)
+        self._item_gramian: Optional[np.ndarray] = None
+        self.db_service = get_database_service()
+        # 전체 상호작용 DataFrame 캐시 (실시간 사용자 기반 추천용)
+        self.interactions_cache_ttl = get_settings().get('performance.interactions_cache_ttl', 300)
+        self._interactions_cache: Optional[pd.DataFrame] = None
+        self._interactions_cache_ts = 0.0
+        self._interaction_stats: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        # 사용자별 상호작용 아이템 인덱스 (정렬 user_id, 구간 경계, user_id순 item_id) - 상호작용 캐시당 1회 구성
+        self._user_item_index: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        # 추천 타입별 DB 인기 아이템 (조회 시각, item_id 목록, 조회 개수) - 상호작용 캐시와 같은 TTL/무효화
+        self._popular_items_cache: Dict[str, Tuple[float, List[int], int]] = {}
+        self._interactions_lock = threading.RLock()
         self.load_models()
     
     def load_models(self) -> bool:
@@ -30,32 +130,67 @@ class ALSRecommendationService:
         try:
             logger.info("ALS 모델 로딩 시작...")
             
-            # ALS 모델 로드
-            with open(f"{self.model_path}/als_model.pkl", "rb") as f:
-                model_data = pickle.load(f)
-            
-            # 모델 데이터 구조 확인 및 분리
-            if isinstance(model_data, dict):
-                # 모델과 메타데이터가 함께 저장된 경우
-                self.model = model_data.get('model')
-                self.user_id_map = model_data.get('user_id_map', {})
-                self.item_id_map = model_data.get('item_id_map', {})
-                self.user_item_matrix = model_data.get('user_item_matrix')
+            if self._artifacts_are_fresh():
+                # 변환된 아티팩트(.npy) 로드 - 언피클 없이 mmap으로 바로 사용
+                self._load_artifacts()
             else:
-                # 모델만 저장된 경우
-                self.model = model_data
-                # 데이터베이스에서 매핑 정보 재구성
-                self._rebuild_mappings()
+                # ALS 모델 로드
+                with open(f"{self.model_path}/als_model.pkl", "rb") as f:
+                    model_data = pickle.load(f)
+                
+                # 모델 데이터 구조 확인 및 분리
+                if isinstance(model_data, dict):
+                    # 모델과 메타데이터가 함께 저장된 경우
+                    self.model = model_data.get('model')
+                    self.user_id_map = model_data.get('user_id_map', {})
+                    self.item_id_map = model_data.get('item_id_map', {})
+                    self.user_item_matrix = model_data.get('user_item_matrix')
+                    self._build_item_index_lookup()
+                    self._build_user_index_lookup()
+                else:
+                    # 모델만 저장된 경우
+                    self.model = model_data
+                    # 데이터베이스에서 매핑 정보 재구성
+                    self._rebuild_mappings()
+                
+                # 팩터 행렬을 float32 연속 배열로 통일
+                self._prepare_factor_arrays()
+                
+                # 다음 시작부터는 피클 대신 아티팩트를 사용하도록 변환본 저장 후 바로 mmap으로 교체
+                # (uvicorn 워커들이 같은 물리 페이지 공유, 저장 불가 환경이면 factor_cache_dir에 내보내 공유)
+                if self.save_artifacts():
+                    self._mmap_artifact_factors()
+                else:
+                    self._share_factor_arrays()
+            
+            self._load_gpu_factors()
+            self._cache_csr_arrays()
+            
+            try:
+                self.model_version = os.path.getmtime(f"{self.model_path}/als_model.pkl")
+            except OSError:
+                self.model_version = 0.0
             
-            # 역방향 매핑 생성
-            self.reverse_user_map = {v: k for k, v in self.user_id_map.items()}
-            self.reverse_item_map = {v: k for k, v in self.item_id_map.items()}
+            self._item_gramian = None
+            
+            # 팩터 수는 모델 로드 시 고정되므로 내적 루프 길이를 상수로 둔 커널 준비 (warmup에서 컴파일)
+            if hasattr(self.model, 'item_factors'):
+                self._score_kernel = specialized_score_kernel(int(self.model.item_factors.shape[1]))
+            
+            # int8 근사 점수로 후보만 고르고 정확 점수로 재정렬 (아이템 팩터 읽기 대역폭 1/4)
+            self._quantized_item_factors = None
+            if self.int8_scoring and SCORE_KERNEL_AVAILABLE and hasattr(self.model, 'item_factors'):
+                self._quantized_item_factors = quantize_rows(self.model.item_factors)
+                logger.info("✅ int8 아이템 팩터 준비 완료 (단일 사용자 점수 계산)")
             
             logger.info(f"✅ ALS 모델 로딩 완료")
             logger.info(f"   - 사용자 수: {len(self.user_id_map)}")
             logger.info(f"   - 아이템 수: {len(self.item_id_map)}")
             logger.info(f"   - 모델 팩터 수: {getattr(self.model, 'n_components', 'N/A')}")
             
+            # 아이템 인기도 미리 계산 (콜드스타트 요청마다 행렬 전체를 합산하지 않도록)
+            self._compute_item_popularity()
+            
             # 아이템 메타데이터 로드 (DB에서)
             self._load_item_metadata()
             
@@ -68,6 +203,214 @@ class ALSRecommendationService:
             self.is_loaded = False
             return False
     
+    @property
+    def artifact_dir(self) -> str:
+        """피클에서 변환한 모델 아티팩트 디렉토리"""
+        return os.path.join(self.model_path, ARTIFACT_DIR_NAME)
+    
+    def _artifacts_are_fresh(self) -> bool:
+        """아티팩트가 존재하고 원본 피클보다 최신인지 확인"""
+        meta_path = os.path.join(self.artifact_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return False
+        
+        # 형식이 바뀐 이전 버전 아티팩트는 다시 생성
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                if json.load(f).get("version") != ARTIFACT_VERSION:
+                    return False
+        except (OSError, ValueError):
+            return False
+        
+        pickle_path = f"{self.model_path}/als_model.pkl"
+        if not os.path.exists(pickle_path):
+            return True
+        return os.path.getmtime(meta_path) >= os.path.getmtime(pickle_path)
+    
+    def save_artifacts(self) -> bool:
+        """팩터 행렬/ID 매핑/상호작용 행렬(CSR 배열)을 .npy로 저장 (피클 없이 mmap으로 로드 가능한 형식)
+        
+        meta.json을 마지막에 기록하므로 중간에 실패한 변환본은 사용되지 않는다.
+        반환: 저장 성공 여부
+        """
+        if self.model is None or not hasattr(self.model, 'item_factors'):
+            return False
+        
+        try:
+            os.makedirs(self.artifact_dir, exist_ok=True)
+            tmp_suffix = f".{os.getpid()}.tmp"
+            
+            arrays = {
+                "user_factors": self.model.user_factors,
+                "item_factors": self.model.item_factors,
+                "user_id_map": np.array(list(self.user_id_map.items()), dtype=np.int64).reshape(-1, 2),
+                "item_id_map": np.array(list(self.item_id_map.items()), dtype=np.int64).reshape(-1, 2)
+            }
+            
+            # 상호작용 행렬은 CSR 구성 배열을 각각 저장 (로드 시 mmap → 요청이 건드린 행의 페이지만 적재)
+            matrix_shape = None
+            if self.user_item_matrix is not None:
+                matrix = self.user_item_matrix.tocsr()
+                matrix_shape = [int(matrix.shape[0]), int(matrix.shape[1])]
+                arrays["ui_indptr"] = matrix.indptr
+                arrays["ui_indices"] = matrix.indices
+                arrays["ui_data"] = matrix.data.astype(np.float32, copy=False)
+            
+            for name, array in arrays.items():
+                path = os.path.join(self.artifact_dir, f"{name}.npy")
+                with open(path + tmp_suffix, "wb") as f:
+                    np.save(f, np.ascontiguousarray(array))
+                os.replace(path + tmp_suffix, path)
+            
+            meta_path = os.path.join(self.artifact_dir, "meta.json")
+            with open(meta_path + tmp_suffix, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": ARTIFACT_VERSION,
+                    "factors": int(self.model.item_factors.shape[1]),
+                    "regularization": float(getattr(self.model, 'regularization', 0.01)),
+                    "alpha": float(getattr(self.model, 'alpha', 1.0)),
+                    "user_item_matrix_shape": matrix_shape,
+                    "created_at": datetime.now().isoformat()
+                }, f)
+            os.replace(meta_path + tmp_suffix, meta_path)
+            
+            logger.info(f"✅ 모델 아티팩트 저장 완료: {self.artifact_dir}")
+            return True
+            
+        except Exception as e:
+            logger.warning(f"⚠️ 모델 아티팩트 저장 실패 - 다음 시작에도 피클 사용: {str(e)}")
+            return False
+    
+    def _load_artifacts(self):
+        """save_artifacts()로 저장한 아티팩트 로드 (팩터 행렬은 copy-on-write mmap)"""
+        from implicit.cpu.als import AlternatingLeastSquares
+        
+        with open(os.path.join(self.artifact_dir, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        
+        # 학습 시 정규화 계수/confidence 배율 복원 (사용자 팩터 재계산에 사용, 이전 아티팩트는 implicit 기본값)
+        self.model = AlternatingLeastSquares(
+            factors=meta["factors"],
+            regularization=meta.get("regularization", 0.01),
+            alpha=meta.get("alpha", 1.0)
+        )
+        self._mmap_artifact_factors()
+        
+        user_map = np.load(os.path.join(self.artifact_dir, "user_id_map.npy"))
+        item_map = np.load(os.path.join(self.artifact_dir, "item_id_map.npy"))
+        self.user_id_map = dict(zip(user_map[:, 0].tolist(), user_map[:, 1].tolist()))
+        self.item_id_map = dict(zip(item_map[:, 0].tolist(), item_map[:, 1].tolist()))
+        
+        # 조회/역방향 배열은 저장된 (ID, 인덱스) 배열에서 바로 생성
+        self._build_item_index_lookup(pairs=item_map)
+        self._build_user_index_lookup(pairs=user_map)
+        
+        # CSR 배열도 copy-on-write mmap (scipy가 인덱스 정렬 등으로 수정해도 파일은 그대로)
+        matrix_shape = meta.get("user_item_matrix_shape")
+        if matrix_shape:
+            self.user_item_matrix = csr_matrix(
+                tuple(
+                    np.load(os.path.join(self.artifact_dir, f"ui_{name}.npy"), mmap_mode='c')
+                    for name in ("data", "indices", "indptr")
+                ),
+                shape=tuple(matrix_shape),
+                copy=False
+            )
+        else:
+            self.user_item_matrix = None
+        
+        logger.info(f"✅ 모델 아티팩트 로드 완료 (피클 생략): {self.artifact_dir}")
+    
+    def _mmap_artifact_factors(self):
+        """아티팩트의 팩터 행렬을 copy-on-write mmap으로 열어 모델에 연결
+        
+        저장 시 float32 C-contiguous로 기록했으므로 추가 변환/복사 없이 페이지 캐시를 그대로 사용한다.
+        """
+        for name in ("user_factors", "item_factors"):
+            setattr(self.model, name, np.load(os.path.join(self.artifact_dir, f"{name}.npy"), mmap_mode='c'))
+    
+    def _prepare_factor_arrays(self):
+        """팩터 행렬(과 user-item 행렬 값)을 C-contiguous float32로 변환
+        
+        CPU 점수 계산은 모두 float32 (BLAS sgemv/sgemm)로 수행하므로
+        float64로 학습된 모델도 읽어야 할 바이트가 절반으로 줄어든다.
+        """
+        # 피클에 함께 저장된 user-item 행렬도 float32 CSR로 통일 (implicit 입력 형식, 아티팩트 크기 절반)
+        if self.user_item_matrix is not None:
+            self.user_item_matrix = csr_matrix(self.user_item_matrix, dtype=np.float32)
+        
+        if self.model is None or not hasattr(self.model, 'item_factors'):
+            return
+        
+        for name in ("user_factors", "item_factors"):
+            setattr(self.model, name, np.ascontiguousarray(getattr(self.model, name), dtype=np.float32))
+    
+    def _share_factor_arrays(self):
+        """팩터 행렬을 .npy로 내보낸 뒤 읽기 전용 mmap으로 다시 열기
+        
+        각 워커가 언피클한 사본 대신 OS 페이지 캐시를 공유하므로
+        --workers N 실행 시에도 팩터 메모리가 N배로 늘지 않는다.
+        """
+        if self.model is None or not hasattr(self.model, 'item_factors'):
+            return
+        
+        try:
+            os.makedirs(self.factor_cache_dir, exist_ok=True)
+            model_mtime = os.path.getmtime(f"{self.model_path}/als_model.pkl")
+            
+            for name in ("user_factors", "item_factors"):
+                path = os.path.join(self.factor_cache_dir, f"{name}.npy")
+                
+                # 모델 파일보다 오래된 경우에만 다시 내보내기 (워커 간 경합은 원자적 rename으로 처리)
+                if not os.path.exists(path) or os.path.getmtime(path) < model_mtime:
+                    tmp_path = f"{path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "wb") as f:
+                        # .npy 헤더가 64바이트 단위로 패딩되므로 mmap 시 데이터도 64바이트 정렬됨
+                        np.save(f, getattr(self.model, name))
+                    os.replace(tmp_path, path)
+                
+                # copy-on-write 매핑: 페이지는 공유하면서 implicit(Cython)이 요구하는 쓰기 가능 버퍼 제공
+                setattr(self.model, name, np.load(path, mmap_mode='c'))
+            
+            logger.info(f"✅ 팩터 행렬 mmap 공유 설정 완료: {self.factor_cache_dir}")
+            
+        except Exception as e:
+            logger.warning(f"⚠️ 팩터 행렬 mmap 설정 실패 - 프로세스 로컬 배열 사용: {str(e)}")
+    
+    def _load_gpu_factors(self):
+        """팩터 행렬을 GPU 텐서로 한 번만 올려두기 (배치 top-k용)"""
+        self.gpu_factors = None
+        if not GPU_AVAILABLE or self.model is None or not hasattr(self.model, 'item_factors'):
+            return
+        
+        try:
+            dtype = GPU_DTYPES.get(self.gpu_dtype)
+            if dtype is None:
+                logger.warning(f"⚠️ 지원하지 않는 GPU dtype '{self.gpu_dtype}' - float16 사용")
+                dtype = torch.float16
+            self.gpu_factors = (
+                torch.from_numpy(np.array(self.model.user_factors, dtype=np.float32)).to('cuda', dtype=dtype),
+                torch.from_numpy(np.array(self.model.item_factors, dtype=np.float32)).to('cuda', dtype=dtype)
+            )
+            logger.info(f"🚀 GPU 팩터 텐서 로드 완료: {torch.cuda.get_device_name(0)} ({dtype})")
+        except Exception as e:
+            logger.warning(f"⚠️ GPU 팩터 로드 실패 - CPU 경로 사용: {str(e)}")
+            self.gpu_factors = None
+    
+    def warmup(self):
+        """첫 요청 전에 점수 계산 경로를 한 번 실행 (팩터 페이지 적재 + JIT 커널 컴파일)"""
+        if not self.is_loaded or not self.user_id_map:
+            return
+        
+        try:
+            user_id = next(iter(self.user_id_map))
+            self._get_collaborative_recommendations(user_id, RecommendationType.RECORD, 1, [])
+            # 배치 경로(미리 계산된 점수 행 + 마스킹) 커널도 같은 타입으로 한 번 실행
+            masked_top_k(self.model.item_factors[:2] @ self.model.user_factors[0], np.empty(0, dtype=np.int64), 1)
+            logger.info("🔥 ALS 모델 워밍업 완료")
+        except Exception as e:
+            logger.warning(f"⚠️ ALS 모델 워밍업 실패 (무시함): {str(e)}")
+    
     def _rebuild_mappings(self):
         """데이터베이스에서 user-item 매핑 재구성"""
         logger.info("사용자-아이템 매핑 재구성 중...")
@@ -79,34 +422,199 @@ class ALSRecommendationService:
             logger.warning("⚠️ 상호작용 데이터가 없습니다.")
             return
         
-        users = sorted(interactions['user_id'].unique())
-        items = sorted(interactions['item_id'].unique())
+        # 정렬된 고유 ID와 각 행의 인덱스를 한 번에 계산 (파이썬 루프 없이)
+        users, rows = np.unique(interactions['user_id'].to_numpy(), return_inverse=True)
+        items, cols = np.unique(interactions['item_id'].to_numpy(), return_inverse=True)
         
-        self.user_id_map = {user_id: idx for idx, user_id in enumerate(users)}
-        self.item_id_map = {item_id: idx for idx, item_id in enumerate(items)}
+        self.user_id_map = dict(zip(users.tolist(), range(len(users))))
+        self.item_id_map = dict(zip(items.tolist(), range(len(items))))
         
-        # user-item matrix 재구성 (학습 시와 동일한 구조)
-        rows = [self.user_id_map[user_id] for user_id in interactions['user_id']]
-        cols = [self.item_id_map[item_id] for item_id in interactions['item_id']]
-        data = interactions['rating'].values
+        # user-item matrix 재구성 (학습 시와 동일한 구조, implicit 입력 형식인 float32)
+        data = interactions['rating'].to_numpy(dtype=np.float32)
         
         self.user_item_matrix = csr_matrix(
-            (data, (rows, cols)), 
-            shape=(len(users), len(items))
+            (data, (rows.astype(np.int32), cols.astype(np.int32))),
+            shape=(len(users), len(items)),
+            dtype=np.float32
         )
         
+        self._cache_csr_arrays()
+        # np.unique 결과는 ID 오름차순 = 행렬 인덱스 순서이므로 dict를 다시 순회하지 않고 조회 배열로 사용
+        self._build_item_index_lookup(items)
+        self._build_user_index_lookup(users)
+        
         logger.info(f"✅ 매핑 재구성 완료: 사용자 {len(users)}명, 아이템 {len(items)}개")
     
+    def _build_item_index_lookup(self, sorted_ids: Optional[np.ndarray] = None, pairs: Optional[np.ndarray] = None):
+        """item_id_map으로 조회용 배열 생성 (ID 정렬 배열 + 인덱스 → ID 역방향 배열)
+        
+        sorted_ids: 행렬 인덱스 i의 ID가 sorted_ids[i]인 오름차순 배열이면 그대로 사용
+        pairs: (item_id, matrix_index) 2열 배열이 이미 있으면 dict를 순회하지 않고 사용 (아티팩트 로드 시)
+        """
+        if sorted_ids is not None:
+            self.item_ids_sorted = sorted_ids.astype(np.int64)
+            self.item_indices_sorted = np.arange(sorted_ids.size, dtype=np.int64)
+            self.reverse_item_ids = self.item_ids_sorted
+            return
+        
+        if pairs is None:
+            pairs = np.array(list(self.item_id_map.items()), dtype=np.int64).reshape(-1, 2)
+        order = np.argsort(pairs[:, 0])
+        self.item_ids_sorted = pairs[order, 0]
+        self.item_indices_sorted = pairs[order, 1]
+        
+        # 역방향 매핑은 행렬 인덱스로 바로 조회하는 배열 (top-k 결과를 한 번에 gather)
+        self.reverse_item_ids = np.full(int(pairs[:, 1].max()) + 1 if len(pairs) else 0, -1, dtype=np.int64)
+        self.reverse_item_ids[pairs[:, 1]] = pairs[:, 0]
+    
+    def _item_indices(self, item_ids: Collection[int]) -> np.ndarray:
+        """아이템 ID 목록 → 행렬 인덱스 배열 (매핑에 없는 ID는 제외)"""
+        if not item_ids or self.item_ids_sorted.size == 0:
+            return np.empty(0, dtype=np.int64)
+        
+        ids = np.fromiter(item_ids, dtype=np.int64, count=len(item_ids))
+        positions = np.minimum(np.searchsorted(self.item_ids_sorted, ids), self.item_ids_sorted.size - 1)
+        found = self.item_ids_sorted[positions] == ids
+        return self.item_indices_sorted[positions[found]]
+    
+    def _build_user_index_lookup(self, sorted_ids: Optional[np.ndarray] = None, pairs: Optional[np.ndarray] = None):
+        """user_id_map으로 조회용 ID 정렬 배열 생성 (sorted_ids/pairs는 _build_item_index_lookup과 동일)"""
+        if sorted_ids is not None:
+            self.user_ids_sorted = sorted_ids.astype(np.int64)
+            self.user_indices_sorted = np.arange(sorted_ids.size, dtype=np.int64)
+            return
+        
+        if pairs is None:
+            pairs = np.array(list(self.user_id_map.items()), dtype=np.int64).reshape(-1, 2)
+        order = np.argsort(pairs[:, 0])
+        self.user_ids_sorted = pairs[order, 0]
+        self.user_indices_sorted = pairs[order, 1]
+    
+    def _user_indices(self, user_ids: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """사용자 ID 목록 → (매핑 존재 여부 마스크, 존재하는 사용자의 행렬 인덱스 배열)"""
+        ids = np.asarray(user_ids, dtype=np.int64)
+        if ids.size == 0 or self.user_ids_sorted.size == 0:
+            return np.zeros(ids.size, dtype=bool), np.empty(0, dtype=np.int64)
+        
+        positions = np.minimum(np.searchsorted(self.user_ids_sorted, ids), self.user_ids_sorted.size - 1)
+        found = self.user_ids_sorted[positions] == ids
+        return found, self.user_indices_sorted[positions[found]]
+    
+    def _cache_csr_arrays(self):
+        """user-item 행렬의 indptr/indices/data를 연속 배열로 한 번만 꺼내 두기"""
+        if self.user_item_matrix is None:
+            self._u_indptr = np.zeros(1, dtype=np.int64)
+            self._u_indices = np.empty(0, dtype=np.int32)
+            self._u_data = np.empty(0, dtype=np.float32)
+            return
+        
+        # CSR이 아닌 형식으로 저장된 피클도 대비 (이미 CSR이면 변환/복사 없음, mmap 배열도 그대로 사용)
+        matrix = self.user_item_matrix.tocsr()
+        self._u_indptr = np.ascontiguousarray(matrix.indptr)
+        self._u_indices = np.ascontiguousarray(matrix.indices)
+        self._u_data = np.ascontiguousarray(matrix.data)
+    
+    def _seen_item_indices(self, user_idx: int) -> np.ndarray:
+        """사용자가 상호작용한 아이템 인덱스 (CSR 배열 슬라이스 - 1행 행렬 생성 없음)"""
+        return self._u_indices[self._u_indptr[user_idx]:self._u_indptr[user_idx + 1]].astype(np.int64)
+    
+    def _seen_coordinates(self, user_indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """여러 사용자의 상호작용 아이템 (row, col) 좌표 - indptr 구간을 한 번에 펼쳐 사용자별 슬라이스 없이 수집"""
+        starts = self._u_indptr[user_indices].astype(np.int64)
+        lengths = self._u_indptr[np.asarray(user_indices) + 1].astype(np.int64) - starts
+        rows = np.repeat(np.arange(len(lengths)), lengths)
+        # 행 r의 j번째 좌표는 CSR 위치 starts[r] + j (j = 전체 순번 - 행 시작 순번)
+        offsets = np.arange(rows.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        cols = self._u_indices[np.repeat(starts, lengths) + offsets].astype(np.int64)
+        return rows, cols
+    
+    def _compute_item_popularity(self):
+        """아이템별 상호작용 수와 상위 인기 아이템 인덱스 계산"""
+        if self.user_item_matrix is None:
+            self.item_popularity = None
+            self.item_popularity_max = 0.0
+            self.popular_indices = np.empty(0, dtype=np.intp)
+            return
+        
+        # 열 합계를 CSR의 열 인덱스 기준 bincount로 계산 (CSC 변환/복사본 없이 O(nnz) 한 번)
+        self.item_popularity = np.bincount(
+            self._u_indices, weights=self._u_data, minlength=self.user_item_matrix.shape[1]
+        ).astype(np.float32)
+        self.item_popularity_max = float(self.item_popularity.max()) if self.item_popularity.size else 0.0
+        self.popular_indices = top_k_indices(self.item_popularity, POPULAR_CANDIDATES)
+        logger.info(f"✅ 아이템 인기도 계산 완료: 상위 {len(self.popular_indices)}개 후보")
+    
+    def rebuilt_copy(self, mode: str) -> "ALSRecommendationService":
+        """모델(팩터 행렬)은 공유하고 매핑/메타데이터만 새로 구성한 사본 반환
+        
+        각 재구성 메서드는 속성을 새 객체로 교체할 뿐 기존 객체를 수정하지 않으므로,
+        원본 인스턴스를 사용 중인 요청은 끝까지 일관된 이전 상태를 본다.
+        mode: "full"이면 상호작용 매핑/행렬/인기도까지, "incremental"이면 메타데이터만
+        """
+        new_service = copy.copy(self)
+        if mode == "full":
+            new_service._rebuild_mappings()
+            new_service._compute_item_popularity()
+        new_service._load_item_metadata()
+        return new_service
+    
     def _load_item_metadata(self):
         """데이터베이스에서 아이템 메타데이터 로드"""
         try:
-            self.item_metadata = self.db_service.get_item_metadata(
-                list(self.item_id_map.keys())
-            )
+            # 추천 결과 조립 시 str() 변환 없이 조회하도록 int 키로 저장
+            self.item_metadata = {
+                int(item_id): metadata
+                for item_id, metadata in self.db_service.get_item_metadata(
+                    list(self.item_id_map.keys())
+                ).items()
+            }
             logger.info(f"✅ 아이템 메타데이터 로딩 완료: {len(self.item_metadata)}개")
         except Exception as e:
             logger.warning(f"⚠️ 메타데이터 로딩 실패: {str(e)}")
             self.item_metadata = {}
+        
+        self._build_attribute_index()
+    
+    def _build_attribute_index(self):
+        """필터 속성(category/region) 값별 아이템 인덱스 배열 생성 (필터를 점수 계산 단계로 내리기 위함)"""
+        index = {key: {} for key in FILTER_ATTRIBUTES}
+        for item_id, metadata in self.item_metadata.items():
+            item_idx = self.item_id_map.get(item_id)
+            if item_idx is None:
+                continue
+            
+            # 추천 결과 metadata에 펼쳐지는 extra 값 기준 (_apply_filters와 같은 값)
+            extra = metadata.get("extra", _EMPTY_METADATA)
+            for key in FILTER_ATTRIBUTES:
+                value = extra.get(key)
+                if value is not None:
+                    index[key].setdefault(value, []).append(item_idx)
+        
+        self.attribute_index = {
+            key: {value: np.array(sorted(indices), dtype=np.int64) for value, indices in values.items()}
+            for key, values in index.items()
+        }
+    
+    def _filter_candidates(self, filters: Optional[Dict]) -> Optional[np.ndarray]:
+        """category/region 필터를 모두 만족하는 아이템 인덱스 (점수 단계에 반영할 수 없으면 None)"""
+        if not filters:
+            return None
+        
+        candidates = None
+        for key in FILTER_ATTRIBUTES:
+            if key not in filters:
+                continue
+            
+            allowed = _as_lookup(filters[key])
+            # 목록이 아닌 값이나 None 허용은 사후 필터(_apply_filters)로만 처리
+            if not isinstance(allowed, frozenset) or None in allowed:
+                return None
+            
+            arrays = [self.attribute_index[key][value] for value in allowed if value in self.attribute_index[key]]
+            matched = np.unique(np.concatenate(arrays)) if arrays else np.empty(0, dtype=np.int64)
+            candidates = matched if candidates is None else np.intersect1d(candidates, matched, assume_unique=True)
+        
+        return candidates
     
     def get_recommendations(
         self, 
@@ -114,14 +622,19 @@ class ALSRecommendationService:
         rec_type: RecommendationType = RecommendationType.RECORD,
         limit: int = 10,
         filters: Optional[Dict] = None,
-        exclude_items: Optional[List[int]] = None
+        exclude_items: Optional[Collection[int]] = None,
+        user_scores: Optional[np.ndarray] = None
     ) -> Tuple[List[RecommendationItem], str]:
-        """사용자별 추천 생성 (하이브리드 방식: 개인화 + 콜드스타트)"""
+        """사용자별 추천 생성 (하이브리드 방식: 개인화 + 콜드스타트)
+        
+        user_scores: 미리 계산된 전체 아이템 점수 (get_recommendations_batch에서 전달)
+        """
         
         if not self.is_loaded:
             raise RuntimeError("모델이 로드되지 않았습니다.")
         
-        exclude_items = exclude_items or []
+        # 제외 목록은 진입 시 한 번만 집합으로 변환 (하위 경로의 멤버십 검사/배열 변환에서 재사용)
+        exclude_items = frozenset(exclude_items or ())
         final_recommendations = []
         algorithm_used = ""
         
@@ -129,8 +642,10 @@ class ALSRecommendationService:
             if user_id in self.user_id_map:
                 # 기존 사용자 - 협업 필터링 시도
                 logger.info(f"🎯 사용자 {user_id}: 협업 필터링 추천 시작")
+                # category/region 필터는 점수 계산 단계에서 후보 아이템으로 반영
                 personal_recs, personal_algo = self._get_collaborative_recommendations(
-                    user_id, rec_type, limit, exclude_items
+                    user_id, rec_type, limit, exclude_items, user_scores,
+                    candidate_items=self._filter_candidates(filters)
                 )
                 final_recommendations.extend(personal_recs)
                 algorithm_used = personal_algo
@@ -154,8 +669,7 @@ class ALSRecommendationService:
                 logger.info(f"🔄 추천 부족 ({len(final_recommendations)}/{limit}) - 콜드스타트로 {remaining_count}개 채우기")
                 
                 # 이미 추천된 아이템들을 제외 목록에 추가
-                used_item_ids = [rec.item_id for rec in final_recommendations]
-                extended_exclude = exclude_items + used_item_ids
+                extended_exclude = exclude_items.union(rec.item_id for rec in final_recommendations)
                 
                 # 콜드스타트 추천 생성
                 coldstart_recs, coldstart_algo = self._get_popularity_recommendations(
@@ -191,69 +705,407 @@ class ALSRecommendationService:
             # fallback: 전체 인기도 기반 추천
             return self._get_popularity_recommendations(rec_type, limit, exclude_items)
     
+    def get_recommendations_simple(
+        self,
+        user_id: int,
+        rec_type: RecommendationType = RecommendationType.RECORD,
+        limit: int = 10,
+        user_scores: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """(item_id, score) 목록만 반환하는 경량 추천 (RecommendationItem 생성 생략)"""
+        
+        if not self.is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다.")
+        
+        if user_id in self.user_id_map:
+            try:
+                pairs = self._score_collaborative(user_id, limit, [], user_scores)
+                if len(pairs) >= limit:
+                    return [(item_id, float(min(max(score, 0.0), 1.0))) for item_id, score in pairs]
+            except Exception as e:
+                logger.warning(f"⚠️ 경량 협업 필터링 실패 (user_id: {user_id}): {str(e)}")
+        
+        # 신규 사용자이거나 개인화 결과가 부족하면 하이브리드 경로 사용
+        recommendations, _ = self.get_recommendations(
+            user_id=user_id,
+            rec_type=rec_type,
+            limit=limit,
+            user_scores=user_scores
+        )
+        return [(rec.item_id, rec.score) for rec in recommendations]
+    
+    def get_recommendations_batch(
+        self,
+        user_ids: List[int],
+        rec_type: RecommendationType = RecommendationType.RECORD,
+        limit: int = 10,
+        scores_buffer: Optional[np.ndarray] = None,
+        fallback: bool = True,
+        gramian: Optional[np.ndarray] = None
+    ) -> List[Optional[List[Tuple[int, float]]]]:
+        """여러 사용자 추천을 한 번에 생성 (기존 사용자 점수는 단일 행렬곱으로 계산)
+        
+        scores_buffer: 호출자가 재사용하는 점수 행렬 버퍼 (score_users_batch 참고)
+        fallback: False이면 행렬곱 결과만으로 채울 수 없는 사용자(신규/결과 부족)는 None으로 남겨
+                  호출자가 사용자별 하이브리드 추천을 병렬로 처리하도록 함
+        gramian: precompute_item_gramian() 결과를 주면 최신 DB 상호작용으로 사용자 팩터를 다시 계산해 점수 계산
+                 (학습 이후 새 상호작용 반영 - 증분 배치용)
+        """
+        
+        if not self.is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다.")
+        
+        batch_pairs = {}
+        remaining_users = user_ids
+        if gramian is not None:
+            batch_pairs = self._recommend_recalculated(user_ids, limit, gramian, scores_buffer)
+            remaining_users = [user_id for user_id in user_ids if user_id not in batch_pairs]
+        recalculated = len(batch_pairs)
+        
+        # 기존 사용자들의 점수를 (사용자 수 x 아이템 수) 행렬로 한 번에 계산
+        found, user_indices = self._user_indices(remaining_users)
+        known_users = np.asarray(remaining_users, dtype=np.int64)[found].tolist()
+        score_rows = {}
+        use_gpu = False
+        if known_users:
+            if self.gpu_factors is not None:
+                try:
+                    batch_pairs.update(zip(known_users, self._recommend_gpu(user_indices, limit)))
+                    use_gpu = True
+                except Exception as e:
+                    logger.warning(f"⚠️ GPU 배치 추천 실패 - CPU 경로 사용: {str(e)}")
+            if not use_gpu:
+                batch_scores = self.score_users_batch(user_indices, scores_buffer)
+                score_rows = dict(zip(known_users, batch_scores))
+                batch_pairs.update(zip(known_users, self._top_k_rows(batch_scores, limit)))
+        
+        logger.info(
+            f"📦 배치 추천 생성: {len(user_ids)}명 (행렬곱 {len(known_users)}명, 팩터 재계산 {recalculated}명, GPU: {use_gpu})"
+        )
+        
+        results = []
+        for user_id in user_ids:
+            pairs = batch_pairs.get(user_id)
+            if pairs is not None and len(pairs) >= limit:
+                results.append(pairs)
+                continue
+            if not fallback:
+                results.append(None)
+                continue
+            results.append(self.get_recommendations_simple(
+                user_id=user_id,
+                rec_type=rec_type,
+                limit=limit,
+                user_scores=score_rows.get(user_id)
+            ))
+        return results
+    
+    def score_users_batch(self, user_indices: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """(사용자 수 x 아이템 수) ALS 점수 행렬 - 단일 GEMM, 이미 상호작용한 아이템은 -inf
+        
+        out: (사용자 수 이상 x 아이템 수) float32 버퍼를 주면 앞쪽 행에 결과를 써서 반환 (청크마다 새로 할당하지 않음).
+        반환값은 버퍼의 뷰이므로 다음 호출 전까지만 유효하다.
+        """
+        return self._score_factors(self.model.user_factors[user_indices], self._seen_coordinates(user_indices), out)
+    
+    def _score_factors(
+        self,
+        user_factors: np.ndarray,
+        seen: Tuple[np.ndarray, np.ndarray],
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """사용자 팩터 행렬 x 아이템 팩터 단일 GEMM, seen (row, col) 좌표는 -inf (out은 score_users_batch와 동일)"""
+        n_users = user_factors.shape[0]
+        n_items = self.model.item_factors.shape[0]
+        if out is not None and out.shape[0] >= n_users and out.shape[1] == n_items and out.dtype == np.float32:
+            scores = np.matmul(user_factors.astype(np.float32, copy=False), self.model.item_factors.T, out=out[:n_users])
+        else:
+            scores = user_factors @ self.model.item_factors.T
+        
+        # 상호작용 아이템 마스킹 (좌표 scatter 한 번)
+        rows, cols = seen
+        if rows.size:
+            scores[rows, cols] = -np.inf
+        return scores
+    
+    def precompute_item_gramian(self) -> np.ndarray:
+        """YᵀY + λI (팩터 x 팩터, float64) - 모든 사용자 팩터 재계산에 공통이므로 모델 로드당 한 번만 계산"""
+        if self._item_gramian is None:
+            item_factors = np.asarray(self.model.item_factors, dtype=np.float64)
+            regularization = float(getattr(self.model, 'regularization', 0.01))
+            self._item_gramian = item_factors.T @ item_factors + regularization * np.eye(item_factors.shape[1])
+        return self._item_gramian
+    
+    def recalculate_user_factors(
+        self,
+        user_ids: List[int],
+        gramian: Optional[np.ndarray] = None
+    ) -> Tuple[List[int], np.ndarray, List[np.ndarray]]:
+        """최신 DB 상호작용으로 사용자 팩터 재계산 (아이템 팩터 고정, implicit ALS 닫힌 해)
+        
+        x_u = (YᵀY + λI + Y_uᵀ(C_u - I)Y_u)⁻¹ Y_uᵀ c_u  (c_u = alpha x 아이템별 평점 합 = implicit 학습 시 Cui와 같은 confidence)
+        반환: (카탈로그 아이템 상호작용이 있는 user_id 목록, (사용자 수 x 팩터) float32, 사용자별 상호작용 아이템 인덱스)
+        """
+        n_factors = self.model.item_factors.shape[1]
+        empty = ([], np.empty((0, n_factors), dtype=np.float32), [])
+        
+        interactions = self._get_interactions_cached()
+        if interactions.empty or not user_ids or self.item_ids_sorted.size == 0:
+            return empty
+        
+        rows = interactions[interactions['user_id'].isin(user_ids)]
+        row_users = rows['user_id'].to_numpy(dtype=np.int64)
+        row_items = rows['item_id'].to_numpy(dtype=np.int64)
+        
+        # 카탈로그(학습 행렬)에 있는 아이템만 사용
+        positions = np.minimum(np.searchsorted(self.item_ids_sorted, row_items), self.item_ids_sorted.size - 1)
+        in_catalog = self.item_ids_sorted[positions] == row_items
+        if not in_catalog.any():
+            return empty
+        
+        # (사용자, 아이템)별 평점 합 - 정렬 결과는 사용자 → 아이템 순
+        pairs, inverse = np.unique(
+            np.stack([row_users[in_catalog], self.item_indices_sorted[positions[in_catalog]]]),
+            axis=1, return_inverse=True
+        )
+        # implicit은 학습 시 상호작용 행렬에 alpha를 곱해 confidence로 사용 (Cui = alpha * r)
+        alpha = float(getattr(self.model, 'alpha', 1.0))
+        confidence = alpha * np.bincount(
+            inverse.ravel(), weights=rows['rating'].to_numpy(dtype=np.float64)[in_catalog]
+        )
+        users, starts = np.unique(pairs[0], return_index=True)
+        bounds = np.append(starts, pairs.shape[1])
+        
+        if gramian is None:
+            gramian = self.precompute_item_gramian()
+        factors = np.empty((users.size, n_factors), dtype=np.float32)
+        seen = []
+        for n, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+            items = pairs[1, start:end]
+            c = confidence[start:end]
+            y_u = np.asarray(self.model.item_factors[items], dtype=np.float64)
+            factors[n] = np.linalg.solve(gramian + (y_u.T * (c - 1.0)) @ y_u, y_u.T @ c)
+            seen.append(items)
+        
+        return users.tolist(), factors, seen
+    
+    def _recommend_recalculated(
+        self,
+        user_ids: List[int],
+        limit: int,
+        gramian: np.ndarray,
+        out: Optional[np.ndarray] = None
+    ) -> Dict[int, List[Tuple[int, float]]]:
+        """재계산한 사용자 팩터로 상위 limit개 (item_id, score) - 학습/최신 상호작용 아이템 모두 제외"""
+        users, factors, seen = self.recalculate_user_factors(user_ids, gramian)
+        if not users:
+            return {}
+        
+        found, train_indices = self._user_indices(users)
+        train_seen = iter(train_indices)
+        seen = [
+            np.union1d(items, self._seen_item_indices(next(train_seen))) if in_train else items
+            for items, in_train in zip(seen, found)
+        ]
+        seen = (np.repeat(np.arange(len(seen)), [len(items) for items in seen]), np.concatenate(seen))
+        
+        # GPU가 있으면 재계산한 팩터만 올려 아이템 팩터 텐서와 곱함 (top-k만 CPU로)
+        if self.gpu_factors is not None:
+            try:
+                item_factors = self.gpu_factors[1]
+                gpu_user_factors = torch.from_numpy(factors).to(item_factors.device, dtype=item_factors.dtype)
+                return dict(zip(users, self._top_k_gpu(gpu_user_factors, seen, limit)))
+            except Exception as e:
+                logger.warning(f"⚠️ GPU 재계산 사용자 점수 계산 실패 - CPU 경로 사용: {str(e)}")
+        return dict(zip(users, self._top_k_rows(self._score_factors(factors, seen, out), limit)))
+    
+    def _top_k_rows(self, scores: np.ndarray, limit: int) -> List[List[Tuple[int, float]]]:
+        """점수 행렬의 행별 상위 limit개 (item_id, score) - 행 단위 argpartition 한 번"""
+        n_items = scores.shape[1]
+        k = min(limit, n_items)
+        if k <= 0:
+            return [[] for _ in range(scores.shape[0])]
+        
+        # -scores로 뒤집지 않고 뒤쪽 k개를 취함 (점수 행렬 크기의 임시 배열 할당/순회 1회 절약)
+        top_items = np.argpartition(scores, n_items - k, axis=1)[:, n_items - k:]
+        top_scores = np.take_along_axis(scores, top_items, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return self._top_k_pairs(
+            np.take_along_axis(top_scores, order, axis=1),
+            np.take_along_axis(top_items, order, axis=1)
+        )
+    
+    def _top_k_pairs(self, top_scores: np.ndarray, top_items: np.ndarray) -> List[List[Tuple[int, float]]]:
+        """행별 top-k 인덱스/점수 → (item_id, 0-1로 정규화한 score) 목록 (마스킹된 -inf 제외)"""
+        top_item_ids = self.reverse_item_ids[top_items]
+        valid_rows = top_scores > -np.inf
+        # 점수 정규화는 행렬 전체에 한 번 적용 (-inf는 0이 되지만 valid 마스크로 제외됨)
+        clipped = np.clip(top_scores, 0.0, 1.0)
+        
+        return [
+            list(zip(row_item_ids[valid].tolist(), row_scores[valid].tolist()))
+            for row_scores, row_item_ids, valid in zip(clipped, top_item_ids, valid_rows)
+        ]
+    
+    def _recommend_gpu(self, user_indices: np.ndarray, limit: int) -> List[List[Tuple[int, float]]]:
+        """GPU에서 (사용자 x 아이템) 점수 계산 후 top-k만 CPU로 가져오기
+        
+        이미 상호작용한 아이템은 GPU 상에서 -inf로 마스킹한다.
+        """
+        user_factors, _ = self.gpu_factors
+        
+        seen = self._seen_coordinates(user_indices)
+        with torch.no_grad():
+            idx = torch.from_numpy(user_indices).to(user_factors.device)
+            return self._top_k_gpu(user_factors[idx], seen, limit)
+    
+    def _top_k_gpu(
+        self,
+        user_factors,
+        seen: Tuple[np.ndarray, np.ndarray],
+        limit: int
+    ) -> List[List[Tuple[int, float]]]:
+        """GPU 사용자 팩터 텐서 x 아이템 팩터 → seen (row, col) 좌표 -inf → top-k만 CPU로 가져오기"""
+        _, item_factors = self.gpu_factors
+        
+        with torch.no_grad():
+            scores = user_factors @ item_factors.T
+            
+            # 상호작용 아이템 마스킹 ((row, col) 좌표를 한 번에 scatter)
+            rows, cols = seen
+            if rows.size:
+                seen_rows = torch.from_numpy(rows).to(scores.device)
+                seen_cols = torch.from_numpy(cols).to(scores.device)
+                scores[seen_rows, seen_cols] = -float('inf')
+            
+            top_scores, top_items = scores.topk(min(limit, scores.shape[1]), dim=1)
+        
+        return self._top_k_pairs(top_scores.float().cpu().numpy(), top_items.cpu().numpy())
+    
+    def _score_collaborative(
+        self,
+        user_id: int,
+        limit: int,
+        exclude_items: Collection[int],
+        user_scores: Optional[np.ndarray] = None,
+        candidate_items: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """협업 필터링 상위 아이템의 (item_id, ALS 원점수) 목록
+        
+        candidate_items: 이 아이템 인덱스들 중에서만 선택 (None이면 전체 아이템)
+        """
+        
+        # 사용자 인덱스 가져오기
+        user_idx = self.user_id_map[user_id]
+        excluded = self._item_indices(exclude_items)
+        
+        if candidate_items is not None:
+            # 제외 아이템은 후보에서 미리 빼기 (implicit은 items와 filter_items 동시 지정 불가)
+            candidate_items = np.setdiff1d(candidate_items, excluded, assume_unique=False)
+            if candidate_items.size == 0:
+                return []
+        
+        if user_scores is None and candidate_items is None and SCORE_KERNEL_AVAILABLE:
+            # JIT 커널로 내적 + 본 아이템/제외 아이템 건너뛰기 + top-k를 한 번에 (전체 점수 벡터 할당 없음)
+            masked = np.concatenate([self._seen_item_indices(user_idx), excluded])
+            if self._quantized_item_factors is not None:
+                top_items, top_scores = quantized_score_top_k(
+                    self.model.user_factors[user_idx],
+                    self.model.item_factors,
+                    *self._quantized_item_factors,
+                    masked,
+                    limit
+                )
+            else:
+                top_items, top_scores = score_top_k(
+                    self.model.user_factors[user_idx],
+                    self.model.item_factors,
+                    masked,
+                    limit,
+                    kernel=self._score_kernel
+                )
+            return list(zip(self.reverse_item_ids[top_items].tolist(), top_scores.tolist()))
+        
+        if user_scores is None:
+            # implicit의 recommend 사용 (BLAS 내적 + C 구현 부분 top-k)
+            # 본 아이템은 CSR 배열 슬라이스로 직접 제외 (사용자 행 행렬을 만들어 넘기지 않음)
+            seen = self._seen_item_indices(user_idx)
+            if candidate_items is not None:
+                candidate_items = np.setdiff1d(candidate_items, seen)
+                if candidate_items.size == 0:
+                    return []
+                ids, scores = self.model.recommend(
+                    user_idx,
+                    None,
+                    N=limit,
+                    filter_already_liked_items=False,
+                    items=candidate_items.astype(np.int32)
+                )
+            else:
+                filtered = np.concatenate([seen, excluded])
+                ids, scores = self.model.recommend(
+                    user_idx,
+                    None,
+                    N=limit,
+                    filter_already_liked_items=False,
+                    filter_items=filtered.astype(np.int32) if len(filtered) else None
+                )
+            # 인덱스 → item_id 일괄 변환 후 파이썬 int/float로 (orjson 직렬화용)
+            valid = scores > -np.inf
+            return list(zip(self.reverse_item_ids[ids[valid]].tolist(), scores[valid].tolist()))
+        
+        # 배치로 미리 계산된 점수 사용 - 이미 상호작용한 아이템과 제외 아이템은 건너뛰고 상위 limit개 선택
+        masked = [self._seen_item_indices(user_idx), excluded]
+        if candidate_items is not None:
+            # 후보가 아닌 아이템도 마스킹
+            allowed = np.zeros(user_scores.shape[0], dtype=bool)
+            allowed[candidate_items] = True
+            masked.append(np.flatnonzero(~allowed))
+        top_items = masked_top_k(user_scores, np.concatenate(masked), limit)
+        
+        # 인덱스 → item_id 일괄 변환 후 파이썬 int/float로 (orjson 직렬화용)
+        return list(zip(self.reverse_item_ids[top_items].tolist(), user_scores[top_items].tolist()))
+    
     def _get_collaborative_recommendations(
         self, 
         user_id: int, 
         rec_type: RecommendationType, 
         limit: int,
-        exclude_items: List[int]
+        exclude_items: Collection[int],
+        user_scores: Optional[np.ndarray] = None,
+        candidate_items: Optional[np.ndarray] = None
     ) -> Tuple[List[RecommendationItem], str]:
         """협업 필터링 기반 추천"""
         
         logger.info(f"협업 필터링 추천 생성 (user_id: {user_id})")
         
-        # 사용자 인덱스 가져오기
-        user_idx = self.user_id_map[user_id]
-        
-        # ALS 모델로 사용자의 아이템 점수 예측
-        # model.predict(user_idx, item_indices)를 사용하거나
-        # user/item factor를 직접 내적 계산
-        user_factors = self.model.user_factors[user_idx]
-        item_factors = self.model.item_factors
-        
-        # 모든 아이템에 대한 점수 계산
-        scores = np.dot(item_factors, user_factors)
+        pairs = self._score_collaborative(user_id, limit, exclude_items, user_scores, candidate_items)
+        if not pairs:
+            return [], "collaborative_filtering"
         
-        # 이미 상호작용한 아이템 제외
-        user_items = self.user_item_matrix[user_idx].indices
-        scores[user_items] = -np.inf
+        # 점수 정규화와 메타데이터 조회를 열 단위로 한 번에 처리한 뒤 객체 생성
+        item_ids, als_scores = zip(*pairs)
+        scores = np.clip(als_scores, 0.0, 1.0).tolist()  # 0-1 범위로 정규화
+        metadatas = [self.item_metadata.get(item_id, _EMPTY_METADATA) for item_id in item_ids]
         
-        # 제외할 아이템들도 점수를 낮춤
-        for item_id in exclude_items:
-            if item_id in self.item_id_map:
-                item_idx = self.item_id_map[item_id]
-                scores[item_idx] = -np.inf
-        
-        # 상위 아이템 선택
-        top_items = np.argsort(scores)[-limit * 2:][::-1]  # 여유분 확보
-        
-        recommendations = []
-        for item_idx in top_items:
-            if len(recommendations) >= limit:
-                break
-                
-            item_id = self.reverse_item_map[item_idx]
-            score = scores[item_idx]
-            
-            # 점수가 유효한 경우만 추가
-            if score > -np.inf:
-                metadata = self.item_metadata.get(str(item_id), {})
-                
-                recommendation = RecommendationItem(
-                    item_id=item_id,
-                    score=float(min(max(score, 0.0), 1.0)),  # 0-1 범위로 정규화
-                    item_type=rec_type,
-                    title=metadata.get("title"),
-                    description=metadata.get("description"),
-                    image_url=metadata.get("image_url"),
-                    metadata={
-                        "method": "collaborative_filtering",
-                        "als_score": float(score),
-                        "popularity_rank": metadata.get("popularity_rank"),
-                        **metadata.get("extra", {})
-                    }
-                )
-                recommendations.append(recommendation)
+        construct = RecommendationItem.model_construct
+        recommendations = [
+            construct(
+                item_id=item_id,
+                score=score,
+                item_type=rec_type,
+                title=metadata.get("title"),
+                description=metadata.get("description"),
+                image_url=metadata.get("image_url"),
+                metadata={
+                    "method": "collaborative_filtering",
+                    "als_score": als_score,
+                    "popularity_rank": metadata.get("popularity_rank"),
+                    **metadata.get("extra", _EMPTY_METADATA)
+                }
+            )
+            for item_id, score, als_score, metadata in zip(item_ids, scores, als_scores, metadatas)
+        ]
         
         return recommendations, "collaborative_filtering"
     
@@ -261,7 +1113,7 @@ class ALSRecommendationService:
         self, 
         rec_type: RecommendationType, 
         limit: int,
-        exclude_items: List[int]
+        exclude_items: Collection[int]
     ) -> Tuple[List[RecommendationItem], str]:
         """인기도 기반 추천 (콜드 스타트 대응)"""
         
@@ -269,30 +1121,33 @@ class ALSRecommendationService:
         
         # 먼저 DB에서 실제 인기 아이템 조회
         try:
-            popular_items = self.db_service.get_popular_items(rec_type.value, limit * 3)
+            popular_items = self._get_popular_items_cached(rec_type.value, limit * 3)
             logger.info(f"DB에서 조회한 인기 아이템: {popular_items}")
         except Exception as e:
             logger.error(f"DB 인기 아이템 조회 실패: {str(e)}")
             popular_items = []
         
         recommendations = []
+        # O(1) 제외 여부 확인 (get_recommendations에서 이미 집합으로 받은 경우 그대로 사용)
+        exclude_set = exclude_items if isinstance(exclude_items, frozenset) else frozenset(exclude_items)
         
         # DB 기반 인기 아이템이 있는 경우
         if popular_items:
             count = 0
+            scores = rank_scores(limit).tolist()
             for item_id in popular_items:
                 if count >= limit:
                     break
                     
-                if item_id in exclude_items:
+                if item_id in exclude_set:
                     continue
                     
-                metadata = self.item_metadata.get(str(item_id), {})
+                metadata = self.item_metadata.get(item_id, _EMPTY_METADATA)
                 
-                # 순위 기반 점수 계산 (첫 번째가 가장 높음)
-                normalized_score = max(0.1, 1.0 - (count * 0.1))
+                # 순위 기반 점수 (첫 번째가 가장 높음)
+                normalized_score = scores[count]
                 
-                recommendation = RecommendationItem(
+                recommendation = RecommendationItem.model_construct(
                     item_id=int(item_id),
                     score=normalized_score,
                     item_type=rec_type,
@@ -309,32 +1164,38 @@ class ALSRecommendationService:
                 )
                 recommendations.append(recommendation)
                 count += 1
-                logger.info(f"인기 추천 추가: item_id={item_id}, score={normalized_score}")
+                logger.debug(f"인기 추천 추가: item_id={item_id}, score={normalized_score}")
         
         # Matrix 기반 백업 (DB 결과가 부족한 경우)
         elif self.user_item_matrix is not None and len(recommendations) < limit:
             logger.info("Matrix 기반 인기도 계산으로 백업")
-            # 각 아이템별 상호작용 수 계산
-            item_popularity = np.array(self.user_item_matrix.sum(axis=0)).flatten()
-            popular_indices = np.argsort(item_popularity)[::-1]
+            # 모델 로딩 시 계산해 둔 아이템별 상호작용 수 사용
+            item_popularity = self.item_popularity
+            max_popularity = self.item_popularity_max
+            # 제외될 수 있는 아이템 수만큼 여유를 두고 상위 후보만 선택
+            # (카탈로그에 없는 제외 ID는 여유분에서 빼서 미리 정렬된 후보 안에서 끝나는 경우를 늘림)
+            excluded = self._item_indices(exclude_items)
+            needed = limit + len(excluded)
+            if needed <= len(self.popular_indices):
+                popular_indices = self.popular_indices[:needed]
+            else:
+                popular_indices = top_k_indices(item_popularity, needed)
+            
+            # 제외 아이템과 역매핑 없는 인덱스를 배열 연산으로 한 번에 걸러낸 뒤 필요한 개수만 사용
+            keep = self.reverse_item_ids[popular_indices] >= 0
+            if excluded.size:
+                keep &= ~np.isin(popular_indices, excluded)
             
             count = len(recommendations)
-            for item_idx in popular_indices:
-                if count >= limit:
-                    break
-                    
-                item_id = self.reverse_item_map.get(item_idx)
-                if not item_id or item_id in exclude_items:
-                    continue
-                    
-                metadata = self.item_metadata.get(str(item_id), {})
+            for item_idx in popular_indices[keep][:limit - count]:
+                item_id = int(self.reverse_item_ids[item_idx])
+                metadata = self.item_metadata.get(item_id, _EMPTY_METADATA)
                 
                 # 인기도 점수 계산
                 popularity_score = item_popularity[item_idx]
-                max_popularity = item_popularity.max()
                 normalized_score = float(popularity_score / max_popularity) if max_popularity > 0 else 0.1
                 
-                recommendation = RecommendationItem(
+                recommendation = RecommendationItem.model_construct(
                     item_id=int(item_id),
                     score=normalized_score,
                     item_type=rec_type,
@@ -359,64 +1220,58 @@ class ALSRecommendationService:
         user_id: int,
         rec_type: RecommendationType, 
         limit: int,
-        exclude_items: List[int]
+        exclude_items: Collection[int]
     ) -> Tuple[List[RecommendationItem], str]:
         """실시간 사용자 기반 추천 (user_actions 테이블 직접 조회)"""
         
         logger.info(f"실시간 사용자 기반 추천 생성 (user_id: {user_id})")
         
         try:
-            # 해당 사용자의 상호작용 데이터 조회
-            user_interactions = self.db_service.get_user_item_interactions()
-            user_data = user_interactions[user_interactions['user_id'] == user_id]
+            # 사용자가 상호작용한 아이템들 (전체 상호작용 TTL 캐시의 사용자별 인덱스에서 구간 조회)
+            user_items_arr = self._user_interacted_items(user_id)
             
-            if len(user_data) == 0:
+            if user_items_arr.size == 0:
                 logger.info(f"사용자 {user_id}의 상호작용 데이터 없음 - 인기도 기반으로 전환")
                 return self._get_popularity_recommendations(rec_type, limit, exclude_items)
             
-            # 사용자가 상호작용한 아이템들
-            user_items = set(user_data['item_id'].tolist())
-            user_preferences = user_data.groupby('item_id')['rating'].mean().to_dict()
+            logger.info(f"사용자 {user_id} 상호작용: {len(user_items_arr)}개 아이템")
             
-            logger.info(f"사용자 {user_id} 상호작용: {len(user_items)}개 아이템")
+            # 전체 아이템 집계 (상호작용 캐시 갱신 시 1회 계산된 정렬 배열 재사용)
+            item_ids_arr, interaction_count, avg_rating = self._get_interaction_stats()
             
-            # 전체 아이템에서 사용자가 아직 상호작용하지 않은 아이템 찾기
-            all_interactions = self.db_service.get_user_item_interactions()
-            all_items = set(all_interactions['item_id'].unique())
-            candidate_items = all_items - user_items - set(exclude_items)
+            # 사용자가 아직 상호작용하지 않은 후보 아이템 마스크
+            candidate_mask = ~np.isin(item_ids_arr, user_items_arr, assume_unique=True)
+            if exclude_items:
+                candidate_mask &= ~np.isin(
+                    item_ids_arr, np.fromiter(exclude_items, dtype=item_ids_arr.dtype, count=len(exclude_items))
+                )
+            candidate_positions = np.flatnonzero(candidate_mask)
             
-            logger.info(f"추천 후보 아이템: {len(candidate_items)}개")
+            logger.info(f"추천 후보 아이템: {len(candidate_positions)}개")
             
-            if not candidate_items:
+            if candidate_positions.size == 0:
                 logger.info("추천 후보 아이템 없음 - 인기도 기반으로 전환")
                 return self._get_popularity_recommendations(rec_type, limit, exclude_items)
             
-            # 후보 아이템들의 인기도 계산
-            item_popularity = all_interactions.groupby('item_id').agg({
-                'rating': ['count', 'mean'],
-                'user_id': 'nunique'
-            }).reset_index()
-            
-            item_popularity.columns = ['item_id', 'interaction_count', 'avg_rating', 'unique_users']
-            item_popularity = item_popularity[item_popularity['item_id'].isin(candidate_items)]
-            
-            # 사용자 선호도와 아이템 인기도를 결합한 점수 계산
-            item_popularity['combined_score'] = (
-                item_popularity['avg_rating'] * 0.4 +  # 평균 평점
-                (item_popularity['interaction_count'] / item_popularity['interaction_count'].max()) * 0.6  # 정규화된 상호작용 수
+            # 사용자 선호도와 아이템 인기도를 결합한 점수 계산 (후보 아이템 기준 정규화)
+            candidate_counts = interaction_count[candidate_positions]
+            combined_score = (
+                avg_rating[candidate_positions] * 0.4 +  # 평균 평점
+                (candidate_counts / candidate_counts.max()) * 0.6  # 정규화된 상호작용 수
             )
             
-            # 상위 아이템 선택
-            top_items = item_popularity.nlargest(limit, 'combined_score')
+            # 상위 아이템 선택 (전체 정렬 없이 argpartition)
+            top = top_k_indices(combined_score, limit)
             
             recommendations = []
-            for idx, row in top_items.iterrows():
-                item_id = int(row['item_id'])
-                score = float(row['combined_score'])
+            for i in top:
+                position = candidate_positions[i]
+                item_id = int(item_ids_arr[position])
+                score = float(combined_score[i])
                 
-                metadata = self.item_metadata.get(str(item_id), {})
+                metadata = self.item_metadata.get(item_id, _EMPTY_METADATA)
                 
-                recommendation = RecommendationItem(
+                recommendation = RecommendationItem.model_construct(
                     item_id=item_id,
                     score=min(max(score, 0.1), 1.0),  # 0.1-1.0 범위로 정규화
                     item_type=rec_type,
@@ -425,9 +1280,9 @@ class ALSRecommendationService:
                     image_url=metadata.get("image_url"),
                     metadata={
                         "method": "user_based_realtime",
-                        "user_interactions": len(user_items),
-                        "item_popularity": int(row['interaction_count']),
-                        "avg_rating": float(row['avg_rating']),
+                        "user_interactions": len(user_items_arr),
+                        "item_popularity": int(interaction_count[position]),
+                        "avg_rating": float(avg_rating[position]),
                         "author_name": metadata.get("author_name"),
                         "author_nickname": metadata.get("author_nickname"),
                         **metadata.get("extra", {})
@@ -442,6 +1297,113 @@ class ALSRecommendationService:
             logger.error(f"실시간 사용자 기반 추천 실패: {str(e)}")
             return self._get_popularity_recommendations(rec_type, limit, exclude_items)
     
+    def _get_interactions_cached(self) -> pd.DataFrame:
+        """전체 상호작용 DataFrame (TTL 동안 재사용 - 신규 사용자 요청마다 테이블 전체를 다시 읽지 않도록)"""
+        with self._interactions_lock:
+            now = time.monotonic()
+            if self._interactions_cache is None or now - self._interactions_cache_ts > self.interactions_cache_ttl:
+                self._interactions_cache = self.db_service.get_user_item_interactions()
+                self._interactions_cache_ts = now
+                self._interaction_stats = None
+                self._user_item_index = None
+            return self._interactions_cache
+    
+    def _get_interaction_stats(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """아이템별 (item_id, 상호작용 수, 평균 평점) 정렬 배열 - 상호작용 캐시당 1회만 groupby"""
+        with self._interactions_lock:
+            interactions = self._get_interactions_cached()
+            if self._interaction_stats is None:
+                # groupby 대신 정렬 고유 ID + bincount (중간 DataFrame 없이 O(행 수) 두 번)
+                item_ids_arr, codes = np.unique(interactions['item_id'].to_numpy(), return_inverse=True)
+                ratings = interactions['rating'].to_numpy(dtype=np.float64)
+                rated = ~np.isnan(ratings)  # groupby count/mean과 동일하게 평점 없는 행은 제외
+                counts = np.bincount(codes[rated], minlength=item_ids_arr.size).astype(np.float64)
+                sums = np.bincount(codes[rated], weights=ratings[rated], minlength=item_ids_arr.size)
+                self._interaction_stats = (item_ids_arr, counts, sums / np.maximum(counts, 1))
+            return self._interaction_stats
+    
+    def _get_user_item_index(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """사용자별 상호작용 아이템 인덱스 - 상호작용 캐시당 1회 정렬 (사용자마다 DataFrame 전체를 필터링하지 않도록)"""
+        with self._interactions_lock:
+            interactions = self._get_interactions_cached()
+            if self._user_item_index is None:
+                if interactions.empty:
+                    empty = np.empty(0, dtype=np.int64)
+                    self._user_item_index = (empty, np.zeros(1, dtype=np.int64), empty)
+                else:
+                    user_arr = interactions['user_id'].to_numpy(dtype=np.int64)
+                    order = np.argsort(user_arr, kind='stable')
+                    users, starts = np.unique(user_arr[order], return_index=True)
+                    self._user_item_index = (
+                        users, np.append(starts, order.size), interactions['item_id'].to_numpy()[order]
+                    )
+            return self._user_item_index
+    
+    def _user_interacted_items(self, user_id: int) -> np.ndarray:
+        """사용자가 상호작용한 고유 item_id (정렬, 없으면 빈 배열) - 인덱스 이진 탐색 + 구간 슬라이스"""
+        users, bounds, items = self._get_user_item_index()
+        position = np.searchsorted(users, user_id)
+        if position >= users.size or users[position] != user_id:
+            return np.empty(0, dtype=items.dtype)
+        return np.unique(items[bounds[position]:bounds[position + 1]])
+    
+    def _get_popular_items_cached(self, rec_type: str, count: int) -> List[int]:
+        """DB 인기 아이템 상위 count개 (타입별로 TTL 동안 재사용 - 콜드스타트 사용자마다 쿼리하지 않도록)"""
+        now = time.monotonic()
+        with self._interactions_lock:
+            cached = self._popular_items_cache.get(rec_type)
+        if cached is not None and now - cached[0] <= self.interactions_cache_ttl and cached[2] >= count:
+            return cached[1][:count]
+        
+        fetch = max(count, POPULAR_ITEMS_FETCH)
+        items = self.db_service.get_popular_items(rec_type, fetch)
+        with self._interactions_lock:
+            self._popular_items_cache[rec_type] = (now, items, fetch)
+        return items[:count]
+    
+    def invalidate_db_caches(self):
+        """상호작용/인기 아이템 캐시 무효화 (배치 시작 시 최신 데이터 사용)"""
+        with self._interactions_lock:
+            self._interactions_cache = None
+            self._interaction_stats = None
+            self._user_item_index = None
+            self._popular_items_cache = {}
+    
+    def interaction_fingerprints(self, user_ids: List[int]) -> np.ndarray:
+        """사용자별 상호작용 지문 (uint64, 상호작용이 없으면 0)
+        
+        행 해시를 사용자별로 더하므로 조회 순서와 무관하고, 상호작용이 추가/제거되면 값이 바뀐다.
+        """
+        user_ids_arr = np.asarray(user_ids, dtype=np.int64)
+        fingerprints = np.zeros(user_ids_arr.size, dtype=np.uint64)
+        
+        interactions = self._get_interactions_cached()
+        if interactions.empty or user_ids_arr.size == 0:
+            return fingerprints
+        
+        columns = [c for c in ('item_id', 'rating', 'created_at') if c in interactions.columns]
+        row_hashes = pd.util.hash_pandas_object(interactions[columns], index=False).to_numpy(dtype=np.uint64)
+        
+        # 사용자별 해시 합 (uint64 오버플로는 모듈로 연산으로 감김)
+        users_arr, codes = np.unique(interactions['user_id'].to_numpy(dtype=np.int64), return_inverse=True)
+        sums = np.zeros(users_arr.size, dtype=np.uint64)
+        np.add.at(sums, codes, row_hashes)
+        
+        positions = np.minimum(np.searchsorted(users_arr, user_ids_arr), users_arr.size - 1)
+        found = users_arr[positions] == user_ids_arr
+        fingerprints[found] = sums[positions[found]]
+        return fingerprints
+    
+    def prefetch_db_caches(self, rec_type: str):
+        """하이브리드 경로가 쓰는 DB 캐시(상호작용 통계/사용자 인덱스, 인기 아이템)를 미리 채움 (실패해도 요청 시 다시 조회)"""
+        try:
+            self._get_interaction_stats()
+            self._get_user_item_index()
+            self._get_popular_items_cached(rec_type, POPULAR_ITEMS_FETCH)
+            logger.info(f"📥 DB 캐시 미리 로드 완료 ({rec_type})")
+        except Exception as e:
+            logger.warning(f"⚠️ DB 캐시 미리 로드 실패: {str(e)}")
+    
     def _apply_filters(
         self, 
         recommendations: List[RecommendationItem], 
@@ -452,28 +1414,27 @@ class ALSRecommendationService:
         if not filters:
             return recommendations
         
-        filtered = []
-        for rec in recommendations:
-            # 카테고리 필터
-            if "category" in filters:
-                item_category = rec.metadata.get("category") if rec.metadata else None
-                if item_category not in filters["category"]:
-                    continue
-            
-            # 지역 필터  
-            if "region" in filters:
-                item_region = rec.metadata.get("region") if rec.metadata else None
-                if item_region not in filters["region"]:
-                    continue
-            
-            # 최소 점수 필터
-            if "min_score" in filters:
-                if rec.score < filters["min_score"]:
-                    continue
-            
-            filtered.append(rec)
+        # 필터 조건을 한 번만 해석해 검사 함수 목록으로 만들기
+        predicates = []
+        
+        # 카테고리/지역 필터 (목록은 set으로 바꿔 O(1) 조회)
+        for key in ("category", "region"):
+            if key in filters:
+                allowed = _as_lookup(filters[key])
+                predicates.append(
+                    lambda rec, key=key, allowed=allowed: (rec.metadata.get(key) if rec.metadata else None) in allowed
+                )
+        
+        # 최소 점수 필터
+        if "min_score" in filters:
+            min_score = filters["min_score"]
+            predicates.append(lambda rec: rec.score >= min_score)
+        
+        # 알려진 필터 키가 없으면 그대로 반환
+        if not predicates:
+            return recommendations
         
-        return filtered
+        return [rec for rec in recommendations if all(predicate(rec) for predicate in predicates)]
     
     def get_model_info(self) -> Dict:
         """모델 정보 반환"""
@@ -0,0 +1,164 @@
+import atexit
+import logging
+import os
+import queue
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Deque, Dict, List, Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 배치 결과 파일 로그 (재시작 후 이력 복원용)
+BATCH_LOG_FILE = "/app/logs/batch.log"
+BATCH_LOG_MAX_BYTES = 10_000_000
+BATCH_LOG_BACKUP_COUNT = 5
+
+# 메모리에 유지할 최근 배치 기록 수
+MAX_BATCH_HISTORY = 100
+
+# 배치 로그 형식: [2024-01-08 14:30:00] FULL BATCH - Status: completed, Users: 50, Recommendations: 500
+_BATCH_LOG_RE = re.compile(
+    r"^\[(?P<ts>[^\]]+)\]\s+(?P<type>\w+)\s+BATCH\s+-\s+Status:\s+(?P<status>\w+)"
+    r".*?Users:\s*(?P<users>\d+).*?Recommendations:\s*(?P<recs>\d+)"
+)
+
+# 최근 배치 기록 (오래된 것부터, maxlen 초과 시 자동 제거)
+BATCH_HISTORY: Deque[Dict[str, Any]] = deque(maxlen=MAX_BATCH_HISTORY)
+_history_lock = threading.Lock()
+_history_loaded = False
+
+# 배치 로그 파일 기록용 로거 (프로세스별 - fork된 워커는 리스너 스레드를 물려받지 못하므로 다시 생성)
+_file_logger: Optional[logging.Logger] = None
+_file_logger_pid: Optional[int] = None
+_file_logger_lock = threading.Lock()
+
+def _get_file_logger() -> logging.Logger:
+    """배치 로그 파일 로거 반환 (lazy loading)
+    
+    호출 스레드는 큐에 넣기만 하고, 파일 쓰기는 QueueListener 스레드가 열어 둔 RotatingFileHandler로 처리한다.
+    """
+    global _file_logger, _file_logger_pid
+    # 이미 이 프로세스용 로거가 있으면 락 없이 바로 반환 (줄마다 락/핸들러 확인을 하지 않음)
+    file_logger = _file_logger
+    if file_logger is not None and _file_logger_pid == os.getpid():
+        return file_logger
+    
+    with _file_logger_lock:
+        if _file_logger is None or _file_logger_pid != os.getpid():
+            os.makedirs(os.path.dirname(BATCH_LOG_FILE), exist_ok=True)
+            file_handler = RotatingFileHandler(
+                BATCH_LOG_FILE,
+                maxBytes=BATCH_LOG_MAX_BYTES,
+                backupCount=BATCH_LOG_BACKUP_COUNT,
+                encoding="utf-8"
+            )
+            file_handler.setFormatter(logging.Formatter("%(message)s"))
+            
+            log_queue = queue.Queue(-1)
+            listener = QueueListener(log_queue, file_handler)
+            listener.start()
+            atexit.register(listener.stop)  # 종료 시 큐에 남은 줄까지 기록
+            
+            file_logger = logging.getLogger(f"{__name__}.file")
+            file_logger.handlers = [QueueHandler(log_queue)]
+            file_logger.propagate = False
+            file_logger.setLevel(logging.INFO)
+            
+            _file_logger = file_logger
+            _file_logger_pid = os.getpid()
+        return _file_logger
+
+def append_batch_log(line: str):
+    """배치 로그 파일에 한 줄 추가 (파일 쓰기는 백그라운드 스레드, 실패는 로그만 남김)"""
+    try:
+        _get_file_logger().info(line.rstrip("\n"))
+    except Exception as e:
+        logger.error(f"❌ 파일 로그 기록 실패: {str(e)}")
+
+def record_batch(
+    batch_type: str,
+    status: str,
+    processed_users: int,
+    total_recommendations: int,
+    error_message: Optional[str] = None
+) -> Dict[str, Any]:
+    """배치 실행 결과를 메모리 이력에 추가"""
+    entry = {
+        "batch_type": batch_type,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "status": status,
+        "processed_users": processed_users,
+        "total_recommendations": total_recommendations,
+        "source": "memory"
+    }
+    if error_message:
+        entry["error"] = error_message
+
+    with _history_lock:
+        BATCH_HISTORY.append(entry)
+    return entry
+
+def extend_batch_history(entries: List[Dict[str, Any]]):
+    """다른 프로세스(배치 워커)에서 전달받은 기록 추가"""
+    with _history_lock:
+        BATCH_HISTORY.extend(entries)
+
+def _tail_lines(path: str, max_lines: int = 10, block_size: int = 8192) -> List[str]:
+    """파일 끝에서부터 블록 단위로 읽어 마지막 max_lines줄만 반환 (파일 전체를 읽지 않음)"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+
+        # 줄 수가 충분해지거나 파일 처음에 도달할 때까지 뒤에서부터 읽기
+        while position > 0 and data.count(b"\n") <= max_lines:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+
+    return data.decode("utf-8", "ignore").splitlines()[-max_lines:]
+
+def _load_history_from_file():
+    """파일 로그의 최근 기록으로 메모리 이력 초기화 (프로세스당 1회)"""
+    if not os.path.exists(BATCH_LOG_FILE):
+        return
+
+    try:
+        entries = []
+        for line in _tail_lines(BATCH_LOG_FILE, MAX_BATCH_HISTORY):
+            match = _BATCH_LOG_RE.match(line)
+            if not match:
+                continue
+
+            entries.append({
+                "batch_type": match.group("type").lower(),
+                "timestamp": match.group("ts"),
+                "status": match.group("status"),
+                "processed_users": int(match.group("users")),
+                "total_recommendations": int(match.group("recs")),
+                "source": "file_log"
+            })
+
+        # 파일 기록이 메모리 기록보다 먼저 발생한 것이므로 앞쪽에 배치
+        room = MAX_BATCH_HISTORY - len(BATCH_HISTORY)
+        if room > 0 and entries:
+            BATCH_HISTORY.extendleft(reversed(entries[-room:]))
+        logger.info(f"📜 배치 이력 복원: 파일 로그 {len(entries)}건")
+
+    except Exception as e:
+        logger.error(f"배치 로그 파일 읽기 실패: {str(e)}")
+
+def get_batch_history(limit: int = 10) -> List[Dict[str, Any]]:
+    """최근 배치 기록을 최신순으로 반환"""
+    global _history_loaded
+    with _history_lock:
+        if not _history_loaded:
+            _load_history_from_file()
+            _history_loaded = True
+        return list(reversed(BATCH_HISTORY))[:limit]
@@ -0,0 +1,142 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.models.schemas import RecommendationType
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# micro-batching 설정 (환경변수로 조정 가능)
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", 64))
+MAX_LATENCY_MS = float(os.getenv("MAX_LATENCY_MS", 10))
+
+class RecommendationBatcher:
+    """ALS 추천 요청 micro-batching
+
+    짧은 시간창(MAX_LATENCY_MS) 안에 들어온 요청을 최대 MAX_BATCH_SIZE개까지 모아
+    (추천 타입, 개수)별로 get_recommendations_batch를 한 번만 호출한다.
+    그룹은 각각 별도 태스크로 처리하고, 행렬곱만으로 채울 수 없는 사용자(신규/결과 부족)는
+    사용자별 하이브리드 추천을 동시에 실행한다.
+    """
+
+    def __init__(
+        self,
+        als_provider: Callable[[], Awaitable[Any]],
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_latency_ms: float = MAX_LATENCY_MS
+    ):
+        self.als_provider = als_provider
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_latency_ms / 1000.0
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # 처리 중인 그룹 태스크 (GC되지 않도록 참조 유지)
+        self._group_tasks: Set[asyncio.Task] = set()
+
+    def start(self):
+        """백그라운드 배치 루프 시작 (현재 이벤트 루프에서)"""
+        if self._task is not None and not self._task.done():
+            return
+        self.queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"🚚 추천 micro-batcher 시작 (batch={self.max_batch_size}, wait={self.max_wait * 1000:.0f}ms)")
+
+    async def stop(self):
+        """백그라운드 배치 루프 종료"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        for task in self._group_tasks:
+            task.cancel()
+        await asyncio.gather(self._task, *self._group_tasks, return_exceptions=True)
+        self._task = None
+        self._group_tasks.clear()
+        logger.info("🛑 추천 micro-batcher 종료")
+
+    async def submit(
+        self,
+        user_id: int,
+        rec_type: RecommendationType,
+        limit: int
+    ) -> List[Tuple[int, float]]:
+        """추천 요청을 큐에 넣고 배치 결과 (item_id, score) 목록을 기다림"""
+        if self._task is None or self._task.done():
+            self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((user_id, rec_type, limit, future))
+        return await future
+
+    async def _drain(self) -> List[tuple]:
+        """첫 요청 도착 후 max_wait 동안 최대 max_batch_size개까지 수집"""
+        loop = asyncio.get_running_loop()
+        items = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(items) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return items
+
+    async def _run(self):
+        """배치 수집 → (타입, 개수)별 그룹화 → 그룹별 태스크로 일괄 추천 (느린 그룹이 다른 그룹을 막지 않음)"""
+        while True:
+            items = await self._drain()
+
+            groups: Dict[Tuple[RecommendationType, int], List[tuple]] = {}
+            for item in items:
+                groups.setdefault((item[1], item[2]), []).append(item)
+
+            for (rec_type, limit), group in groups.items():
+                task = asyncio.create_task(self._process_group(rec_type, limit, group))
+                self._group_tasks.add(task)
+                task.add_done_callback(self._group_tasks.discard)
+
+    async def _process_group(self, rec_type: RecommendationType, limit: int, group: List[tuple]):
+        """그룹 일괄 추천 → 행렬곱으로 못 채운 사용자는 사용자별로 동시에 처리 → future에 결과 전달"""
+        try:
+            als = await self.als_provider()
+            if als is None or not als.is_loaded:
+                raise RuntimeError("모델이 로드되지 않았습니다.")
+
+            # 행렬곱/top-k는 스레드풀에서 실행 (BLAS가 GIL을 놓으므로 다른 요청 처리와 병행)
+            # fallback=False: DB 조회가 섞인 하이브리드 경로를 한 스레드에서 순차 실행하지 않도록 None으로 받음
+            results = await run_in_threadpool(
+                als.get_recommendations_batch,
+                [user_id for user_id, _, _, _ in group], rec_type, limit,
+                fallback=False
+            )
+        except Exception as e:
+            logger.error(f"❌ 배치 추천 실패 ({rec_type}, {len(group)}건): {str(e)}")
+            for _, _, _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # 신규/결과 부족 사용자는 요청별로 스레드풀에서 동시에 하이브리드 추천
+        pending = [n for n, pairs in enumerate(results) if pairs is None]
+        if pending:
+            fallback_results = await asyncio.gather(*[
+                run_in_threadpool(als.get_recommendations_simple, group[n][0], rec_type, limit)
+                for n in pending
+            ], return_exceptions=True)
+            for n, result in zip(pending, fallback_results):
+                results[n] = result
+
+        for (user_id, _, _, future), result in zip(group, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                logger.error(f"❌ 사용자 {user_id} 추천 실패 ({rec_type}): {str(result)}")
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -1,372 +1,714 @@
 import asyncio
-import schedule
-import time
-from typing import List, Dict, Any
+import contextlib
+import gc
+import logging
+import multiprocessing
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
-from app.services.database_service import DatabaseService
+from app.services.batch_history import BATCH_HISTORY, append_batch_log, record_batch
+from app.services.database_service import RecommendationRow, dispose_async_engine, get_database_service
 from app.services.als_service import ALSRecommendationService
+from app.utils.config import get_settings
 from app.utils.logger import get_logger
 from app.models.schemas import RecommendationType
 
+# 샤드 워커 프로세스별 BLAS 스레드 제한 (선택) - implicit 의존성으로 보통 설치되어 있음
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+# 메모리 사용량 점검 (선택) - 없으면 메모리 체크 생략
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 logger = get_logger(__name__)
 
+# 배치 처리 시 사용자별 추천 개수 (10 → 50으로 증가)
+BATCH_RECOMMENDATION_LIMIT = 50
+
+# 한 번의 행렬곱으로 점수를 계산할 사용자 수 (CPU는 점수 행렬 전체를 메모리에 올리므로 작게)
+SCORING_BATCH_SIZE = 100
+# GPU는 top-k만 호스트로 가져오므로 훨씬 큰 배치로 cuBLAS를 채움
+SCORING_BATCH_SIZE_GPU = 1000
+
+# 전체 배치 사용자 조회 페이지 크기 (user_id 순 keyset 페이지, 처리 중에 다음 페이지를 미리 조회)
+USER_PAGE_SIZE = 10000
+
+# 진행상황 로그 주기 (청크 수) - 작은 청크로 도는 CPU/Mini 배치에서 청크마다 로그를 남기지 않도록
+PROGRESS_LOG_CHUNKS = 10
+
+# 메모리 사용량 점검 주기 (청크 수) - GC + RSS 조회를 청크마다 하지 않음
+MEMORY_CHECK_CHUNKS = 5
+# 메모리 한도 대비 이 비율을 넘었을 때만 gc.collect() 실행
+MEMORY_GC_RATIO = 0.9
+
+# 추천 저장 단위 (행 수) - 이만큼 모이면 다음 청크 점수 계산과 겹쳐 백그라운드로 저장
+SAVE_CHUNK_ROWS = 5000
+# 이전 저장이 끝나지 않았을 때 계산을 멈추지 않고 쌓아 둘 수 있는 최대 행 수 (넘으면 저장 완료까지 대기)
+MAX_BUFFERED_ROWS = SAVE_CHUNK_ROWS * 4
+
+# 스케줄러: 전체 배치 실행 시각(시)과 증분 배치 주기(초)
+FULL_BATCH_HOUR = 2
+INCREMENTAL_BATCH_INTERVAL = 6 * 3600
+# 긴 대기 중 벽시계와 다시 맞추는 최대 간격(초)
+SCHEDULER_RESYNC_SECONDS = 3600
+
+# 증분 배치: 사용자별 마지막 처리 시점의 (모델 버전, 상호작용 지문) - 같은 프로세스의 다음 증분 배치에서 재사용
+_incremental_fingerprints: Dict[int, Tuple[float, int]] = {}
+
+class RecommendationSaver:
+    """배치 추천 레코드를 SAVE_CHUNK_ROWS 단위로 모아 백그라운드 태스크에서 저장
+    
+    저장은 한 번에 하나만 진행하며 (메모리/DB 커넥션 제한), 저장하는 동안 호출자는 다음 청크를 계산한다.
+    저장이 계산보다 느리면 MAX_BUFFERED_ROWS까지 버퍼를 키워 다음 저장에 묶고, 그 이상일 때만 계산을 멈춘다.
+    save_recommendations_batch는 사용자 단위로 기존 추천을 교체하므로 청크 경계에서만 내보내
+    한 사용자의 추천이 여러 저장으로 나뉘지 않게 한다.
+    """
+    
+    def __init__(self, db_service, batch_id: int):
+        self.db_service = db_service
+        self.batch_id = batch_id if batch_id > 0 else 0
+        # 청크 결과 목록을 그대로 모아 두고 (add 시 행 복사 없음) 저장 직전에 한 번에 펼침
+        self.chunks: List[List[RecommendationRow]] = []
+        self.buffered_rows = 0
+        self.saved = 0  # 저장 완료된 추천 수
+        self.failed = False
+        self._pending: Optional[asyncio.Task] = None
+        self._pending_rows = 0
+    
+    async def add(self, recommendations: List[RecommendationRow]) -> bool:
+        """청크 추천 추가 (버퍼가 SAVE_CHUNK_ROWS 이상이면 저장 시작). 반환: 지금까지 저장 실패 없음"""
+        if recommendations:
+            self.chunks.append(recommendations)
+            self.buffered_rows += len(recommendations)
+        if self.buffered_rows >= SAVE_CHUNK_ROWS:
+            # 이전 저장이 아직 진행 중이면 MAX_BUFFERED_ROWS까지는 계속 쌓아 다음 저장 한 번으로 묶음
+            if self._saving() and self.buffered_rows < MAX_BUFFERED_ROWS:
+                return not self.failed
+            return await self._flush()
+        return not self.failed
+    
+    async def close(self) -> bool:
+        """남은 버퍼 저장 후 진행 중인 저장까지 완료 대기. 반환: 전체 저장 성공 여부"""
+        await self._flush()
+        return await self._wait()
+    
+    async def _flush(self) -> bool:
+        """이전 저장 완료를 기다린 뒤 현재 버퍼를 백그라운드 저장으로 넘김"""
+        if not await self._wait():
+            return False
+        if self.chunks:
+            chunks, self.chunks = self.chunks, []
+            self._pending_rows, self.buffered_rows = self.buffered_rows, 0
+            self._pending = asyncio.create_task(self._save_chunks(chunks))
+        return True
+    
+    async def _save_chunks(self, chunks: List[List[RecommendationRow]]) -> bool:
+        """청크 목록을 펼쳐 비동기 엔진 풀로 저장 (청크가 하나면 복사 없이 그대로 사용)"""
+        rows = chunks[0] if len(chunks) == 1 else list(chain.from_iterable(chunks))
+        return await self.db_service.save_recommendations_batch_async(rows, self.batch_id)
+    
+    def _saving(self) -> bool:
+        """백그라운드 저장이 진행 중인지 여부"""
+        return self._pending is not None and not self._pending.done()
+    
+    async def _wait(self) -> bool:
+        """진행 중인 저장 완료 대기"""
+        if self._pending is not None:
+            success = await self._pending
+            self._pending = None
+            if success:
+                self.saved += self._pending_rows
+                logger.info(f"✅ 배치 저장 완료: {self._pending_rows}건, 누적: {self.saved}건")
+            else:
+                self.failed = True
+        return not self.failed
+
 class BatchService:
     """추천 시스템 배치 처리 서비스"""
     
     def __init__(self):
-        self.db_service = DatabaseService()
+        self.db_service = get_database_service()
         self.rec_service = ALSRecommendationService()
         self.is_running = False
+        self._scheduler_tasks: List[asyncio.Task] = []
+        self._schedule_lock: Optional[asyncio.Lock] = None
         self.memory_limit_mb = 1500  # 메모리 제한 (1.5GB)
+        self._process: Optional["psutil.Process"] = None
+        self._psutil_warned = False
+        self.use_gpu = self.rec_service.gpu_factors is not None
+        self.scoring_batch_size = SCORING_BATCH_SIZE_GPU if self.use_gpu else SCORING_BATCH_SIZE
+        
+        # 사용자별 추천은 대부분 DB 대기이므로 스레드로 병렬 실행 (동기 엔진 커넥션 풀 폭을 넘지 않게)
+        settings = get_settings()
+        pool_width = settings.get('datasource.pool.size', 5) + settings.get('datasource.pool.max_overflow', 10)
+        self.user_concurrency = max(1, min(settings.get('performance.batch_concurrency', 16), pool_width))
+        # 사용자별 추천 전용 스레드풀 (기본 executor는 CPU 수 + 4개라 동시 실행 수가 설정보다 작아질 수 있음)
+        self._user_executor: Optional[ThreadPoolExecutor] = None
+        # 전체 배치를 나눠 처리할 워커 프로세스 수 (1이면 현재 프로세스에서 처리)
+        self.batch_processes = max(1, int(settings.get('performance.batch_processes', 1)))
+        
+        # CPU 배치 점수 행렬 버퍼 (청크는 순차 처리되므로 한 번 할당해 모든 청크에서 재사용)
+        self._scores_buffer: Optional[np.ndarray] = None
+        # 배치 시작 시 DB 캐시 미리 로드 태스크 (태스크가 GC되지 않도록 참조 유지)
+        self._prefetch_task: Optional[asyncio.Task] = None
     
     async def run_full_batch(self) -> bool:
         """전체 사용자 추천 배치 처리 (메모리 효율적)"""
         logger.info("🚀 전체 추천 배치 처리 시작 (메모리 효율적 방식)")
         
-        # 대상 사용자 조회
-        user_ids = self.db_service.get_users_for_batch_processing("full")
-        if not user_ids:
+        # 대상 사용자 수만 먼저 조회 (목록은 처리하면서 페이지 단위로 가져옴)
+        total_users = await asyncio.to_thread(self.db_service.count_users_for_batch_processing)
+        if not total_users:
             logger.warning("⚠️ 배치 처리 대상 사용자가 없습니다")
             return False
         
-        # 배치 로그 생성 (실패해도 계속 진행)
-        batch_id = self.db_service.create_batch_log("full", len(user_ids))
-        if not batch_id:
-            logger.info("ℹ️ DB 배치 로그 미사용 - 파일 로그만 사용하여 계속 진행")
-            batch_id = -1  # 임시 ID
+        # CPU는 메모리 절약을 위해 작게, GPU는 top-k만 가져오므로 크게
+        chunk_size = self.scoring_batch_size if self.use_gpu else 20
+        # 사용자가 충분히 많으면 CPU 경로는 워커 프로세스 샤드로 나눠 병렬 처리 (샤드 분할에는 전체 목록이 필요)
+        if self.batch_processes > 1 and not self.use_gpu and total_users > self.scoring_batch_size * self.batch_processes:
+            user_ids = await asyncio.to_thread(self.db_service.get_users_for_batch_processing, "full")
+            if not user_ids:
+                logger.warning("⚠️ 배치 처리 대상 사용자가 없습니다")
+                return False
+            # 샤드 워커가 각자 DB 캐시를 채우므로 점수 계산을 하지 않는 부모 프로세스에서는 갱신하지 않음
+            return await self._run_batch("full", user_ids, chunk_size, check_memory=True, sharded=True)
         
-        try:
-            total_recommendations = 0
-            processed_users = 0
-            
-            # **메모리 효율적 처리**: 작은 배치 단위로 처리하고 즉시 저장
-            batch_size = 20  # 배치 크기를 더 작게 (메모리 절약)
-            
-            for i in range(0, len(user_ids), batch_size):
-                batch_users = user_ids[i:i + batch_size]
-                batch_recommendations = []  # 배치별 임시 저장소
-                
-                logger.info(f"📦 배치 {i//batch_size + 1}/{(len(user_ids)-1)//batch_size + 1} 처리 중: {len(batch_users)}명")
-                
-                for user_id in batch_users:
-                    try:
-                        # 사용자별 추천 생성
-                        user_recs = await self._generate_user_recommendations(user_id)
-                        batch_recommendations.extend(user_recs)
-                        processed_users += 1
-                        
-                        # 진행상황 로깅
-                        if processed_users % 50 == 0:
-                            logger.info(f"📊 진행상황: {processed_users}/{len(user_ids)} 사용자 처리 완료")
-                            
-                    except Exception as e:
-                        logger.error(f"❌ 사용자 {user_id} 추천 생성 실패: {str(e)}")
-                        continue
-                
-                # **즉시 DB 저장 및 메모리 해제**
-                if batch_recommendations:
-                    success = self.db_service.save_recommendations_batch(
-                        batch_recommendations, batch_id if batch_id > 0 else 0
-                    )
-                    
-                    if success:
-                        total_recommendations += len(batch_recommendations)
-                        logger.info(f"✅ 배치 저장 완료: {len(batch_recommendations)}건, 누적: {total_recommendations}건")
-                    else:
-                        logger.error("❌ 배치 저장 실패 - 처리 중단")
-                        break
-                
-                # **메모리 해제**
-                del batch_recommendations
-                
-                # **가비지 컬렉션 강제 실행**
-                import gc
-                gc.collect()
-                
-                # **메모리 사용량 체크 및 제한 확인**
-                if not self._check_memory_usage():
-                    logger.error("❌ 메모리 제한 초과로 배치 처리 중단")
-                    # 현재까지의 결과는 유지하고 중단
-                    if batch_id > 0:
-                        self.db_service.update_batch_log(
-                            batch_id, processed_users, total_recommendations, "stopped", "메모리 제한 초과"
-                        )
-                    self._write_batch_log_to_file("full", processed_users, total_recommendations, "stopped", "메모리 제한 초과")
-                    return False
-                
-                # 메모리 사용량이 너무 높으면 경고
-                try:
-                    import psutil
-                    process = psutil.Process()
-                    memory_mb = process.memory_info().rss / 1024 / 1024
-                    if memory_mb > 1024:  # 1GB 초과
-                        logger.warning(f"⚠️ 높은 메모리 사용량 감지: {memory_mb:.1f}MB")
-                except:
-                    pass
-            
-            # 최종 배치 로그 업데이트 (batch_id가 유효한 경우만)
-            if batch_id > 0:
-                self.db_service.update_batch_log(
-                    batch_id, processed_users, total_recommendations, "completed"
-                )
-            
-            logger.info(f"✅ 전체 배치 처리 완료: {processed_users}명, {total_recommendations}건 추천")
-            
-            # 배치 로그를 파일에도 기록
-            self._write_batch_log_to_file("full", processed_users, total_recommendations, "completed")
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ 전체 배치 처리 실패: {str(e)}")
-            if batch_id > 0:
-                self.db_service.update_batch_log(
-                    batch_id, processed_users, 0, "failed", str(e)
-                )
-            self._write_batch_log_to_file("full", processed_users, 0, "failed", str(e))
-            return False
+        # 배치마다 최신 상호작용/인기 아이템 데이터를 한 번만 읽어 사용자 간에 재사용
+        await self._refresh_db_caches()
+        
+        # 전체 목록을 메모리에 올리지 않고 첫 페이지가 도착하는 대로 점수 계산 시작
+        return await self._run_batch(
+            "full", self._iter_user_pages(), chunk_size, total_users=total_users, check_memory=True
+        )
     
     async def run_incremental_batch(self) -> bool:
         """증분 추천 배치 처리 (최근 활동 사용자만)"""
         logger.info("🔄 증분 추천 배치 처리 시작")
         
+        # 배치마다 최신 상호작용/인기 아이템 데이터를 한 번만 읽어 사용자 간에 재사용
+        await self._refresh_db_caches()
+        
         # 최근 활동 사용자 조회
-        user_ids = self.db_service.get_users_for_batch_processing("incremental")
+        user_ids = await asyncio.to_thread(self.db_service.get_users_for_batch_processing, "incremental")
         if not user_ids:
             logger.info("ℹ️ 증분 처리 대상 사용자가 없습니다")
+            await self._wait_prefetch()
             return True
         
-        # 배치 로그 생성 (실패해도 계속 진행)
-        batch_id = self.db_service.create_batch_log("incremental", len(user_ids))
-        if not batch_id:
-            logger.info("ℹ️ DB 배치 로그 미사용 - 파일 로그만 사용하여 계속 진행")
-            batch_id = -1  # 임시 ID
+        # 지난 증분 배치 이후 상호작용과 모델이 그대로인 사용자는 결과가 같으므로 건너뜀
+        user_ids, fingerprints = await asyncio.to_thread(self._filter_unchanged_users, user_ids)
+        if not user_ids:
+            logger.info("ℹ️ 상호작용이 바뀐 증분 처리 대상 사용자가 없습니다")
+            await self._wait_prefetch()
+            return True
         
+        # 증분 대상은 학습 이후 상호작용이 바뀐 사용자이므로 최신 상호작용으로 사용자 팩터를 다시 계산
+        # (YᵀY + λI는 사용자와 무관하므로 배치당 한 번만 계산해 모든 청크에서 재사용)
         try:
-            all_recommendations = []
-            processed_users = 0
-            
-            for user_id in user_ids:
-                try:
-                    user_recs = await self._generate_user_recommendations(user_id)
-                    all_recommendations.extend(user_recs)
-                    processed_users += 1
-                    
-                except Exception as e:
-                    logger.error(f"❌ 사용자 {user_id} 증분 추천 실패: {str(e)}")
-                    continue
-            
-            # DB 저장
-            if all_recommendations:
-                success = self.db_service.save_recommendations_batch(
-                    all_recommendations, batch_id if batch_id > 0 else 0
-                )
-                
-                if success:
-                    if batch_id > 0:
-                        self.db_service.update_batch_log(
-                            batch_id, processed_users, len(all_recommendations), "completed"
-                        )
-                    logger.info(f"✅ 증분 배치 처리 완료: {processed_users}명, {len(all_recommendations)}건 추천")
-                    
-                    # 배치 로그를 파일에도 기록
-                    self._write_batch_log_to_file("incremental", processed_users, len(all_recommendations), "completed")
-                    
-                    return True
-                else:
-                    logger.error("❌ 증분 배치 저장 실패")
-                    if batch_id > 0:
-                        self.db_service.update_batch_log(
-                            batch_id, processed_users, 0, "failed", "저장 실패"
-                        )
-                    self._write_batch_log_to_file("incremental", processed_users, 0, "failed", "저장 실패")
-                    return False
-            else:
-                logger.info("ℹ️ 생성된 추천이 없습니다")
-                if batch_id > 0:
-                    self.db_service.update_batch_log(
-                        batch_id, processed_users, 0, "completed"
-                    )
-                self._write_batch_log_to_file("incremental", processed_users, 0, "completed", "추천 없음")
-                return True
-                
+            gramian = await asyncio.to_thread(self.rec_service.precompute_item_gramian)
         except Exception as e:
-            logger.error(f"❌ 증분 배치 처리 실패: {str(e)}")
-            if batch_id > 0:
-                self.db_service.update_batch_log(
-                    batch_id, processed_users, 0, "failed", str(e)
-                )
-            self._write_batch_log_to_file("incremental", processed_users, 0, "failed", str(e))
-            return False
+            logger.warning(f"⚠️ 사용자 팩터 재계산 준비 실패 - 학습된 팩터로 처리: {str(e)}")
+            gramian = None
+        
+        produced_users = set()
+        success = await self._run_batch(
+            "incremental", user_ids, self.scoring_batch_size, gramian=gramian, produced_users=produced_users
+        )
+        if success:
+            # 추천 행을 만들어 저장까지 끝난 사용자만 다음 증분 배치에서 건너뛸 수 있도록 기록
+            # (생성에 실패한 사용자는 상호작용이 그대로여도 다음 증분 배치에서 다시 처리)
+            _incremental_fingerprints.update(
+                (user_id, fingerprint) for user_id, fingerprint in fingerprints.items() if user_id in produced_users
+            )
+        return success
     
     async def run_mini_batch(self, user_limit: int = 50) -> bool:
         """Mini 배치 처리 (사용자 수 제한, 메모리 효율적)"""
         logger.info(f"🔄 Mini 배치 처리 시작 (최대 {user_limit}명, 메모리 효율적)")
         
-        # 제한된 수의 사용자 조회
-        all_user_ids = self.db_service.get_users_for_batch_processing("full")
-        if not all_user_ids:
+        # 배치마다 최신 상호작용/인기 아이템 데이터를 한 번만 읽어 사용자 간에 재사용
+        await self._refresh_db_caches()
+        
+        # 제한된 수의 사용자만 DB에서 조회 (전체 목록을 가져와 자르지 않음)
+        user_ids = await asyncio.to_thread(self.db_service.get_users_for_batch_processing, "full", user_limit)
+        if not user_ids:
             logger.info("ℹ️ 배치 처리 대상 사용자가 없습니다")
+            await self._wait_prefetch()
             return True
         
-        # 사용자 수 제한
-        user_ids = all_user_ids[:user_limit]
-        logger.info(f"📊 전체 사용자: {len(all_user_ids)}명, Mini 배치 대상: {len(user_ids)}명")
+        logger.info(f"📊 Mini 배치 대상: {len(user_ids)}명 (최대 {user_limit}명)")
+        
+        # mini batch는 더 작은 단위로
+        return await self._run_batch("mini", user_ids, 10)
+    
+    async def _run_batch(
+        self,
+        batch_type: str,
+        user_ids: Union[List[int], AsyncIterator[List[int]]],
+        chunk_size: int,
+        gramian: Optional[np.ndarray] = None,
+        check_memory: bool = False,
+        sharded: bool = False,
+        total_users: Optional[int] = None,
+        produced_users: Optional[set] = None
+    ) -> bool:
+        """배치 공통 처리 (full/incremental/mini): 배치 로그 생성 → 청크별 점수 계산/저장 → 결과 기록
+        
+        user_ids: 사용자 목록 또는 사용자 페이지 비동기 이터레이터 (_iter_user_pages, 이때 total_users 필요)
+        gramian: 사용자 팩터 재계산용 YᵀY + λI (_generate_batch_recommendations 참고)
+        check_memory: 청크마다 메모리 제한 확인 (초과 시 저장된 결과까지만 남기고 중단)
+        sharded: 워커 프로세스 샤드로 나눠 처리 (_run_sharded)
+        produced_users: 주면 추천 행을 만든 user_id를 추가 (샤드 경로 제외, _process_users 참고)
+        """
+        if total_users is None:
+            total_users = len(user_ids)
         
-        # 배치 로그 생성
-        batch_id = self.db_service.create_batch_log("mini", len(user_ids))
+        # 배치 로그 생성 (실패해도 계속 진행)
+        batch_id = await asyncio.to_thread(self.db_service.create_batch_log, batch_type, total_users)
         if not batch_id:
             logger.info("ℹ️ DB 배치 로그 미사용 - 파일 로그만 사용하여 계속 진행")
-            batch_id = -1
+            batch_id = -1  # 임시 ID
+        
+        if sharded:
+            try:
+                processed_users, total_recommendations, success = await self._run_sharded(
+                    user_ids, batch_id, chunk_size, check_memory
+                )
+                status, error_message = ("completed", None) if success else ("failed", "샤드 처리 실패")
+            except Exception as e:
+                processed_users, total_recommendations, status, error_message = 0, 0, "failed", str(e)
+        else:
+            processed_users, total_recommendations, status, error_message = await self._process_users(
+                batch_type, user_ids, batch_id, chunk_size, gramian, check_memory, total_users, produced_users
+            )
+        
+        if status == "completed":
+            logger.info(f"✅ {batch_type} 배치 처리 완료: {processed_users}명, {total_recommendations}건 추천")
+            if not total_recommendations:
+                error_message = "추천 없음"
+        else:
+            logger.error(f"❌ {batch_type} 배치 처리 {status}: {error_message}")
+        
+        # 최종 배치 로그 업데이트 (batch_id가 유효한 경우만) + 파일 로그
+        if batch_id > 0:
+            await asyncio.to_thread(
+                self.db_service.update_batch_log, batch_id, processed_users, total_recommendations, status, error_message
+            )
+        self._write_batch_log_to_file(batch_type, processed_users, total_recommendations, status, error_message)
+        return status == "completed"
+    
+    async def _process_users(
+        self,
+        batch_type: str,
+        user_ids: Union[List[int], AsyncIterator[List[int]]],
+        batch_id: int,
+        chunk_size: int,
+        gramian: Optional[np.ndarray] = None,
+        check_memory: bool = False,
+        total_users: Optional[int] = None,
+        produced_users: Optional[set] = None
+    ) -> Tuple[int, int, str, Optional[str]]:
+        """사용자를 chunk_size명씩 점수 계산하고 SAVE_CHUNK_ROWS 단위로 저장 (저장은 다음 청크 계산과 겹쳐 진행)
+        
+        저장은 사용자 단위로 기존 추천을 교체하므로 나눠 저장해도 결과가 같고, 전체 목록을 쌓지 않는다.
+        user_ids가 페이지 이터레이터이면 total_users는 진행상황 표시용 예상 사용자 수다.
+        produced_users: 주면 추천 행을 하나 이상 만든 user_id를 추가 (생성 실패 사용자 제외)
+        반환: (처리 사용자 수, 저장 추천 수, 상태 completed/stopped/failed, 오류 메시지)
+        """
+        saver = RecommendationSaver(self.db_service, batch_id)
+        processed_users = 0
+        if total_users is None:
+            total_users = len(user_ids)
+        n_chunks = (total_users - 1) // chunk_size + 1
+        log_progress = logger.isEnabledFor(logging.INFO)
+        logger.info(f"📦 {batch_type} 배치 시작: {total_users}명, {n_chunks}개 청크 ({chunk_size}명 단위)")
         
         try:
-            total_recommendations = 0
-            processed_users = 0
-            
-            # **메모리 효율적 처리**: 더 작은 배치 단위
-            batch_size = 10  # mini batch는 더 작은 단위로
-            
-            for i in range(0, len(user_ids), batch_size):
-                batch_users = user_ids[i:i + batch_size]
-                batch_recommendations = []  # 배치별 임시 저장소
-                
-                logger.info(f"📦 Mini 배치 {i//batch_size + 1}/{(len(user_ids)-1)//batch_size + 1} 처리 중: {len(batch_users)}명")
-                
-                for user_id in batch_users:
-                    try:
-                        user_recs = await self._generate_user_recommendations(user_id)
-                        batch_recommendations.extend(user_recs)
-                        processed_users += 1
-                        
-                        # 진행상황 로깅 (mini batch는 더 자주)
-                        if processed_users % 5 == 0:
-                            logger.info(f"📊 Mini 배치 진행: {processed_users}/{len(user_ids)} 사용자 처리 완료")
-                            
-                    except Exception as e:
-                        logger.error(f"❌ 사용자 {user_id} 추천 생성 실패: {str(e)}")
-                        continue
-                
-                # **즉시 DB 저장 및 메모리 해제**
-                if batch_recommendations:
-                    success = self.db_service.save_recommendations_batch(
-                        batch_recommendations, batch_id if batch_id > 0 else 0
-                    )
+            async with contextlib.aclosing(self._user_chunks(user_ids, chunk_size)) as chunks:
+                chunk_no = 0
+                async for chunk_users in chunks:
+                    chunk_no += 1
+                    
+                    # 청크 내 사용자 점수를 한 번의 행렬곱으로 생성
+                    chunk_recs, chunk_produced = await self._generate_batch_recommendations(chunk_users, gramian)
+                    processed_users += len(chunk_users)
+                    if produced_users is not None:
+                        produced_users.update(chunk_produced)
+                    if log_progress and (chunk_no % PROGRESS_LOG_CHUNKS == 0 or chunk_no == n_chunks):
+                        logger.info(
+                            f"📊 진행상황: {chunk_no}/{n_chunks} 청크, {processed_users}/{total_users} 사용자 처리 완료"
+                        )
                     
-                    if success:
-                        total_recommendations += len(batch_recommendations)
-                        logger.info(f"✅ Mini 배치 저장 완료: {len(batch_recommendations)}건, 누적: {total_recommendations}건")
-                    else:
-                        logger.error("❌ Mini 배치 저장 실패 - 처리 중단")
+                    if not await saver.add(chunk_recs):
                         break
-                
-                # **메모리 해제**
-                del batch_recommendations
-                
-                # **가비지 컬렉션**
-                import gc
-                gc.collect()
-                
-                # **메모리 사용량 체크**
-                try:
-                    import psutil
-                    process = psutil.Process()
-                    memory_mb = process.memory_info().rss / 1024 / 1024
-                    logger.info(f"🧠 메모리 사용량: {memory_mb:.1f}MB (Mini 배치 {i//batch_size + 1} 완료)")
-                except ImportError:
-                    logger.info("📝 psutil 없음 - 메모리 모니터링 생략")
-            
-            # 최종 배치 로그 업데이트
-            if batch_id > 0:
-                self.db_service.update_batch_log(
-                    batch_id, processed_users, total_recommendations, "completed"
-                )
-            
-            logger.info(f"✅ Mini 배치 처리 완료: {processed_users}명, {total_recommendations}건 추천")
-            
-            # 파일 로그 기록
-            self._write_batch_log_to_file("mini", processed_users, total_recommendations, "completed")
+                    del chunk_recs
+                    
+                    if check_memory and chunk_no % MEMORY_CHECK_CHUNKS == 0:
+                        if not self._check_memory_usage():
+                            # 현재까지의 결과는 저장하고 중단
+                            await saver.close()
+                            return processed_users, saver.saved, "stopped", "메모리 제한 초과"
             
-            return True
+            # 남은 추천 저장 완료 대기
+            if not await saver.close():
+                return processed_users, saver.saved, "failed", "저장 실패"
+            return processed_users, saver.saved, "completed", None
             
         except Exception as e:
-            logger.error(f"❌ Mini 배치 처리 실패: {str(e)}")
-            if batch_id > 0:
-                self.db_service.update_batch_log(
-                    batch_id, processed_users, 0, "failed", str(e)
+            # 진행 중인 백그라운드 저장과 이미 계산된 청크는 마저 저장 (루프 종료 시 저장 태스크가 취소되지 않도록)
+            await saver.close()
+            return processed_users, saver.saved, "failed", str(e)
+        
+        finally:
+            # 배치가 끝난 뒤 미리 로드 스레드가 캐시를 채우지 않도록 여기서 완료를 기다림
+            await self._wait_prefetch()
+    
+    @staticmethod
+    async def _user_chunks(
+        user_ids: Union[List[int], AsyncIterator[List[int]]],
+        chunk_size: int
+    ) -> AsyncIterator[List[int]]:
+        """사용자 목록 또는 페이지 이터레이터를 chunk_size명씩 나눠 반환 (페이지 경계에 걸친 청크는 다음 페이지와 이어 붙임)"""
+        if isinstance(user_ids, list):
+            for i in range(0, len(user_ids), chunk_size):
+                yield user_ids[i:i + chunk_size]
+            return
+        
+        carry: List[int] = []
+        async with contextlib.aclosing(user_ids) as pages:
+            async for page in pages:
+                if carry:
+                    page = carry + page
+                end = len(page) - len(page) % chunk_size
+                for i in range(0, end, chunk_size):
+                    yield page[i:i + chunk_size]
+                carry = page[end:]
+        if carry:
+            yield carry
+    
+    async def _iter_user_pages(self) -> AsyncIterator[List[int]]:
+        """전체 배치 사용자를 USER_PAGE_SIZE명씩 user_id 순으로 조회 (현재 페이지를 처리하는 동안 다음 페이지를 미리 조회)"""
+        fetch = self.db_service.get_user_page_for_batch_processing
+        pending = asyncio.create_task(asyncio.to_thread(fetch, None, USER_PAGE_SIZE))
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                if len(page) == USER_PAGE_SIZE:
+                    pending = asyncio.create_task(asyncio.to_thread(fetch, page[-1], USER_PAGE_SIZE))
+                if page:
+                    yield page
+        finally:
+            if pending is not None:
+                pending.cancel()
+    
+    async def _run_sharded(
+        self,
+        user_ids: List[int],
+        batch_id: int,
+        chunk_size: int,
+        check_memory: bool = False
+    ) -> Tuple[int, int, bool]:
+        """사용자 목록을 batch_processes개 연속 구간으로 나눠 워커 프로세스별로 점수 계산/저장
+        
+        팩터/CSR은 모델 아티팩트 mmap이므로 워커들이 같은 물리 페이지를 공유한다.
+        chunk_size/check_memory는 각 워커의 _process_users에 그대로 전달한다.
+        반환: (처리 사용자 수, 저장 추천 수, 모든 샤드 성공 여부)
+        """
+        shard_size = -(-len(user_ids) // self.batch_processes)
+        shards = [user_ids[i:i + shard_size] for i in range(0, len(user_ids), shard_size)]
+        # 워커마다 BLAS가 전체 코어를 쓰면 과구독되므로 코어를 나눠 배정
+        blas_threads = max(1, (os.cpu_count() or 1) // len(shards))
+        logger.info(f"🧩 샤드 배치 시작: {len(shards)}개 프로세스 x 최대 {shard_size}명 (워커당 BLAS 스레드 {blas_threads})")
+        
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = await asyncio.gather(*[
+                loop.run_in_executor(
+                    executor, run_batch_shard, shard, batch_id, blas_threads, chunk_size, check_memory
                 )
-            self._write_batch_log_to_file("mini", processed_users, 0, "failed", str(e))
-            return False
+                for shard in shards
+            ], return_exceptions=True)
+        
+        processed_users = total_recommendations = 0
+        success = True
+        for shard_no, result in enumerate(results, 1):
+            if isinstance(result, BaseException):
+                logger.error(f"❌ 샤드 {shard_no} 처리 실패: {str(result)}")
+                success = False
+                continue
+            shard_processed, shard_saved, shard_success = result
+            processed_users += shard_processed
+            total_recommendations += shard_saved
+            success = success and shard_success
+        return processed_users, total_recommendations, success
     
-    async def _generate_user_recommendations(self, user_id: int) -> List[Dict[str, Any]]:
-        """개별 사용자 추천 생성"""
+    async def _process_shard(
+        self,
+        user_ids: List[int],
+        batch_id: int,
+        chunk_size: int,
+        check_memory: bool = False
+    ) -> Tuple[int, int, bool]:
+        """샤드 사용자를 청크 단위로 점수 계산/저장 (run_batch_shard 워커에서 실행)
+        
+        반환: (처리 사용자 수, 저장 추천 수, 저장 성공 여부)
+        """
+        await self._refresh_db_caches()
+        processed_users, saved, status, error_message = await self._process_users(
+            "full", user_ids, batch_id, chunk_size, check_memory=check_memory
+        )
+        if status != "completed":
+            logger.error(f"❌ 샤드 처리 {status}: {error_message}")
+        return processed_users, saved, status == "completed"
+    
+    def _filter_unchanged_users(self, user_ids: List[int]) -> Tuple[List[int], Dict[int, Tuple[float, int]]]:
+        """지난 증분 배치와 모델 버전/상호작용 지문이 같은 사용자 제외
+        
+        반환: (처리할 사용자 목록, 처리 성공 시 기록할 사용자별 지문)
+        """
+        try:
+            fingerprints = self.rec_service.interaction_fingerprints(user_ids).tolist()
+        except Exception as e:
+            logger.warning(f"⚠️ 상호작용 지문 계산 실패 - 전체 사용자 처리: {str(e)}")
+            return user_ids, {}
+        
+        version = self.rec_service.model_version
+        current = {user_id: (version, fingerprint) for user_id, fingerprint in zip(user_ids, fingerprints)}
+        changed = [user_id for user_id in user_ids if _incremental_fingerprints.get(user_id) != current[user_id]]
+        
+        skipped = len(user_ids) - len(changed)
+        if skipped:
+            logger.info(f"⏭️ 변경 없는 사용자 {skipped}명 건너뜀 (처리 대상: {len(changed)}명)")
+        return changed, {user_id: current[user_id] for user_id in changed}
+    
+    async def _refresh_db_caches(self):
+        """DB 캐시 무효화 후 백그라운드로 다시 채움
+        
+        사용자 조회/첫 청크 행렬곱과 겹쳐 로드되므로, 하이브리드 경로 사용자가
+        처음 나올 때 전체 상호작용 조회를 기다리지 않는다.
+        이전 배치의 미리 로드가 남아 있으면 끝난 뒤 무효화한다 (무효화 후 이전 데이터로 다시 채우지 않도록).
+        """
+        await self._wait_prefetch()
+        self.rec_service.invalidate_db_caches()
+        self._prefetch_task = asyncio.create_task(
+            asyncio.to_thread(self.rec_service.prefetch_db_caches, RecommendationType.RECORD.value)
+        )
+    
+    async def _wait_prefetch(self):
+        """진행 중인 DB 캐시 미리 로드 완료 대기 (prefetch_db_caches는 실패를 로그로만 남기므로 예외 없음)"""
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is not None:
+            await task
+    
+    async def _generate_batch_recommendations(
+        self,
+        user_ids: List[int],
+        gramian: Optional[np.ndarray] = None
+    ) -> Tuple[List[RecommendationRow], List[int]]:
+        """여러 사용자 추천을 한 번에 생성 (기존 사용자 점수는 단일 행렬곱)
+        
+        gramian: 주면 최신 상호작용으로 사용자 팩터를 재계산 (get_recommendations_batch 참고)
+        반환: (추천 레코드 목록, 추천 행을 하나 이상 만든 user_id 목록)
+        """
+        try:
+            # 행렬곱은 스레드에서 실행 (이벤트 루프 차단 방지)
+            # 행렬곱만으로 채울 수 없는 사용자는 None으로 받아 아래에서 병렬 처리
+            results = await asyncio.to_thread(
+                self.rec_service.get_recommendations_batch,
+                user_ids, RecommendationType.RECORD, BATCH_RECOMMENDATION_LIMIT,
+                self._get_scores_buffer(len(user_ids)), False, gramian
+            )
+        except Exception as e:
+            # 일괄 생성 실패 시 사용자별로 다시 시도
+            logger.warning(f"⚠️ 일괄 추천 생성 실패 - 사용자별 생성으로 전환: {str(e)}")
+            return await self._generate_users_concurrently(user_ids)
+        
+        produced = [user_id for user_id, pairs in zip(user_ids, results) if pairs]
+        recommendations = [
+            (user_id, item_id, "log", score)
+            for user_id, pairs in zip(user_ids, results) if pairs is not None
+            for item_id, score in pairs
+        ]
+        
+        # 신규/결과 부족 사용자는 DB 조회가 섞인 하이브리드 경로이므로 동시에 실행
+        pending_users = [user_id for user_id, pairs in zip(user_ids, results) if pairs is None]
+        if pending_users:
+            pending_recs, pending_produced = await self._generate_users_concurrently(pending_users)
+            recommendations.extend(pending_recs)
+            produced.extend(pending_produced)
+        return recommendations, produced
+    
+    async def _generate_users_concurrently(self, user_ids: List[int]) -> Tuple[List[RecommendationRow], List[int]]:
+        """사용자별 추천을 동시에 생성 (세마포어로 동시 실행 수 제한, 실패한 사용자는 건너뜀)
+        
+        반환: (추천 레코드 목록, 추천 행을 하나 이상 만든 user_id 목록)
+        """
+        semaphore = asyncio.Semaphore(self.user_concurrency)
+        per_user = await asyncio.gather(*[
+            self._generate_user_recommendations(user_id, semaphore) for user_id in user_ids
+        ], return_exceptions=True)
+        
         recommendations = []
+        produced = []
+        for user_id, recs in zip(user_ids, per_user):
+            if isinstance(recs, BaseException):
+                logger.error(f"❌ 사용자 {user_id} 추천 생성 실패: {str(recs)}")
+                continue
+            if recs:
+                recommendations.extend(recs)
+                produced.append(user_id)
+        return recommendations, produced
+    
+    def _get_scores_buffer(self, rows: int) -> Optional[np.ndarray]:
+        """청크 크기 이상의 (사용자 x 아이템) float32 버퍼 반환 (GPU 경로는 점수 행렬을 호스트로 가져오지 않으므로 None)"""
+        model = self.rec_service.model
+        if self.use_gpu or model is None or not hasattr(model, 'item_factors'):
+            return None
         
+        n_items = model.item_factors.shape[0]
+        buffer = self._scores_buffer
+        if buffer is None or buffer.shape[0] < rows or buffer.shape[1] != n_items:
+            buffer = np.empty((rows, n_items), dtype=np.float32)
+            self._scores_buffer = buffer
+        return buffer
+    
+    async def _generate_user_recommendations(self, user_id: int, semaphore: asyncio.Semaphore) -> List[RecommendationRow]:
+        """개별 사용자 추천 생성 (세마포어로 동시 실행 수 제한, 전용 스레드풀에서 실행)"""
+        async with semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_user_executor(), self._generate_user_recommendations_sync, user_id
+            )
+    
+    def _get_user_executor(self) -> ThreadPoolExecutor:
+        """사용자별 추천 스레드풀 반환 (lazy 생성, user_concurrency개 스레드)"""
+        if self._user_executor is None:
+            self._user_executor = ThreadPoolExecutor(
+                max_workers=self.user_concurrency, thread_name_prefix="batch-user"
+            )
+        return self._user_executor
+    
+    def _generate_user_recommendations_sync(self, user_id: int) -> List[RecommendationRow]:
+        """개별 사용자 추천 생성"""
         try:
             # 여행 기록 추천 (enum 사용) - 더 많은 추천 생성
             log_recs, algorithm = self.rec_service.get_recommendations(
                 user_id=user_id, 
                 rec_type=RecommendationType.RECORD, 
-                limit=50  # 10 → 50으로 증가 (더 많은 추천 생성)
+                limit=BATCH_RECOMMENDATION_LIMIT
             )
-            
-            for rec_item in log_recs:
-                recommendations.append({
-                    "user_id": user_id,
-                    "item_id": rec_item.item_id, 
-                    "item_type": "log",
-                    "score": rec_item.score
-                })
+            return [(user_id, rec_item.item_id, "log", rec_item.score) for rec_item in log_recs]
                 
         except Exception as e:
             logger.error(f"❌ 사용자 {user_id} 추천 생성 실패: {str(e)}")
             # 빈 추천 반환
-            
-        return recommendations
+            return []
     
-    def start_scheduler(self):
-        """스케줄러 시작"""
+    async def start_scheduler(self):
+        """스케줄러 시작 (asyncio 태스크가 다음 실행 시각까지 대기, stop_scheduler() 호출 전까지 반환하지 않음)"""
         if self.is_running:
             logger.warning("⚠️ 스케줄러가 이미 실행 중입니다")
             return
         
         logger.info("🕐 추천 배치 스케줄러 시작")
         
-        # 스케줄 등록
-        schedule.every().day.at("02:00").do(self._run_full_batch_sync)      # 매일 새벽 2시
-        schedule.every(6).hours.do(self._run_incremental_batch_sync)        # 6시간마다
-        
         self.is_running = True
+        # 전체/증분 배치가 같은 시각에 겹치지 않도록 직렬화
+        self._schedule_lock = asyncio.Lock()
+        self._scheduler_tasks = [
+            asyncio.create_task(self._full_batch_loop()),        # 매일 새벽 2시
+            asyncio.create_task(self._incremental_batch_loop())  # 6시간마다
+        ]
         
-        # 스케줄러 실행 루프
-        while self.is_running:
-            try:
-                schedule.run_pending()
-                time.sleep(60)  # 1분마다 체크
-            except KeyboardInterrupt:
-                logger.info("🛑 스케줄러 중단 요청")
-                break
-            except Exception as e:
-                logger.error(f"❌ 스케줄러 오류: {str(e)}")
-                time.sleep(60)
-        
-        logger.info("⏹️ 추천 배치 스케줄러 종료")
+        try:
+            await asyncio.gather(*self._scheduler_tasks)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.is_running = False
+            logger.info("⏹️ 추천 배치 스케줄러 종료")
     
     def stop_scheduler(self):
-        """스케줄러 중지"""
+        """스케줄러 중지 (대기 중인 스케줄 태스크 취소)"""
         self.is_running = False
-        schedule.clear()
+        for task in self._scheduler_tasks:
+            task.cancel()
+        self._scheduler_tasks = []
         logger.info("🛑 스케줄러 중지됨")
     
+    @staticmethod
+    def _next_full_batch_time(after: datetime) -> datetime:
+        """after 이후 첫 전체 배치 시각 (FULL_BATCH_HOUR시 정각)"""
+        next_run = after.replace(hour=FULL_BATCH_HOUR, minute=0, second=0, microsecond=0)
+        if next_run <= after:
+            next_run += timedelta(days=1)
+        return next_run
+    
+    @staticmethod
+    async def _sleep_until(target: datetime):
+        """벽시계 기준 target 시각까지 대기
+        
+        asyncio.sleep은 단조 시계 기준이라 절전/시각 보정 시 벽시계와 어긋나므로
+        최대 SCHEDULER_RESYNC_SECONDS마다 깨어 남은 시간을 다시 계산한다.
+        """
+        while True:
+            remaining = (target - datetime.now()).total_seconds()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, SCHEDULER_RESYNC_SECONDS))
+    
+    async def _full_batch_loop(self):
+        """매일 FULL_BATCH_HOUR시에 전체 배치 실행
+        
+        다음 실행 시각은 직전 예정 시각 이후로 계산하므로 조금 일찍 깨어나도 같은 회차를 두 번 실행하지 않는다.
+        """
+        next_run = self._next_full_batch_time(datetime.now())
+        while self.is_running:
+            await self._sleep_until(next_run)
+            await self._run_scheduled_batch("full", self.run_full_batch)
+            next_run = self._next_full_batch_time(max(next_run, datetime.now()))
+    
+    async def _incremental_batch_loop(self):
+        """INCREMENTAL_BATCH_INTERVAL초마다 증분 배치 실행
+        
+        실행 시각을 시작 시점 기준 고정 간격으로 계산하므로 배치 소요 시간만큼 일정이 밀리지 않는다.
+        (배치가 간격보다 오래 걸려 지나간 회차는 건너뜀)
+        """
+        loop = asyncio.get_running_loop()
+        next_run = loop.time() + INCREMENTAL_BATCH_INTERVAL
+        while self.is_running:
+            await asyncio.sleep(max(0.0, next_run - loop.time()))
+            await self._run_scheduled_batch("incremental", self.run_incremental_batch)
+            
+            now = loop.time()
+            next_run += INCREMENTAL_BATCH_INTERVAL
+            if next_run <= now:
+                next_run += ((now - next_run) // INCREMENTAL_BATCH_INTERVAL + 1) * INCREMENTAL_BATCH_INTERVAL
+    
+    async def _run_scheduled_batch(self, batch_type: str, job):
+        """스케줄된 배치 실행 (오류가 나도 다음 스케줄은 계속)"""
+        async with self._schedule_lock:
+            try:
+                await job()
+            except Exception as e:
+                logger.error(f"❌ 스케줄러 오류 ({batch_type}): {str(e)}")
+    
     def _write_batch_log_to_file(self, batch_type: str, processed_users: int, 
                                 total_recommendations: int, status: str, 
                                 error_message: str = None):
-        """배치 로그를 파일에 기록 (DB 실패 시 백업용)"""
+        """배치 로그를 메모리 이력과 파일에 기록 (파일은 재시작 후 이력 복원용)"""
+        record_batch(batch_type, status, processed_users, total_recommendations, error_message)
+        
         try:
-            import os
-            from datetime import datetime
-            
-            log_file = "/app/logs/batch.log"
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
             log_entry = f"[{timestamp}] {batch_type.upper()} BATCH - "
@@ -375,24 +717,12 @@ class BatchService:
             if error_message:
                 log_entry += f", Error: {error_message}"
             
-            log_entry += "\n"
-            
-            # 로그 파일에 추가
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            # 로그 파일에 추가 (버퍼링된 백그라운드 기록)
+            append_batch_log(log_entry)
                 
         except Exception as e:
             logger.error(f"❌ 파일 로그 기록 실패: {str(e)}")
     
-    def _run_full_batch_sync(self):
-        """동기 방식으로 전체 배치 실행 (스케줄러용)"""
-        asyncio.run(self.run_full_batch())
-    
-    def _run_incremental_batch_sync(self):
-        """동기 방식으로 증분 배치 실행 (스케줄러용)"""
-        asyncio.run(self.run_incremental_batch())
-    
     async def manual_batch_trigger(self, batch_type: str = "incremental", user_limit: int = None) -> Dict[str, Any]:
         """수동 배치 트리거 (API용)"""
         logger.info(f"🔧 수동 배치 트리거: {batch_type}" + (f" (최대 {user_limit}명)" if user_limit else ""))
@@ -423,10 +753,17 @@ class BatchService:
     def _check_memory_usage(self) -> bool:
         """메모리 사용량 체크 및 제한 초과 시 False 반환"""
         try:
-            import psutil
-            process = psutil.Process()
+            process = self._get_process()
+            if process is None:
+                return True
+            
             memory_mb = process.memory_info().rss / 1024 / 1024
             
+            # 한도에 가까울 때만 전체 GC 후 다시 측정 (평소에는 모델 팩터 등 장수 객체 전체 순회를 하지 않음)
+            if memory_mb > self.memory_limit_mb * MEMORY_GC_RATIO:
+                gc.collect()
+                memory_mb = process.memory_info().rss / 1024 / 1024
+            
             if memory_mb > self.memory_limit_mb:
                 logger.error(f"❌ 메모리 제한 초과: {memory_mb:.1f}MB > {self.memory_limit_mb}MB")
                 return False
@@ -434,9 +771,54 @@ class BatchService:
             logger.info(f"🧠 메모리 사용량: {memory_mb:.1f}MB / {self.memory_limit_mb}MB")
             return True
             
-        except ImportError:
-            logger.warning("⚠️ psutil 없음 - 메모리 체크 생략")
-            return True
         except Exception as e:
             logger.error(f"❌ 메모리 체크 실패: {str(e)}")
-            return True 
\ No newline at end of file
+            return True 
+    
+    def _get_process(self) -> Optional["psutil.Process"]:
+        """현재 프로세스 psutil 핸들 반환 (lazy 생성 후 재사용, psutil이 없으면 None)"""
+        if self._process is None and psutil is not None:
+            self._process = psutil.Process()
+        elif psutil is None and not self._psutil_warned:
+            logger.warning("⚠️ psutil 없음 - 메모리 체크 생략")
+            self._psutil_warned = True
+        return self._process
+
+async def _run_and_dispose(coro):
+    """배치 코루틴 실행 후 비동기 엔진 정리 (aiomysql 풀은 이벤트 루프에 묶이므로 asyncio.run마다 정리)"""
+    try:
+        return await coro
+    finally:
+        await dispose_async_engine()
+
+def run_batch_job(batch_type: str, user_limit: Optional[int] = None) -> Tuple[bool, List[Dict[str, Any]]]:
+    """배치 1회 실행 (API 서버의 ProcessPoolExecutor 워커 프로세스에서 호출)
+    
+    워커 프로세스의 메모리 이력은 API 프로세스에서 보이지 않으므로
+    (성공 여부, 이번 실행의 배치 기록)을 함께 반환한다.
+    """
+    BATCH_HISTORY.clear()
+    batch_service = BatchService()
+    
+    if batch_type == "full":
+        if user_limit:
+            # 사용자 수 제한된 배치
+            success = asyncio.run(_run_and_dispose(batch_service.run_mini_batch(user_limit)))
+        else:
+            # 전체 배치
+            success = asyncio.run(_run_and_dispose(batch_service.run_full_batch()))
+    else:
+        success = asyncio.run(_run_and_dispose(batch_service.run_incremental_batch()))
+    return success, list(BATCH_HISTORY)
+
+def run_batch_shard(
+    user_ids: List[int],
+    batch_id: int,
+    blas_threads: int,
+    chunk_size: int,
+    check_memory: bool = False
+) -> Tuple[int, int, bool]:
+    """전체 배치 사용자 샤드 1개 처리 (BatchService._run_sharded의 워커 프로세스에서 호출)"""
+    limits = threadpool_limits(limits=blas_threads) if threadpool_limits is not None else contextlib.nullcontext()
+    with limits:
+        return asyncio.run(_run_and_dispose(BatchService()._process_shard(user_ids, batch_id, chunk_size, check_memory)))
@@ -1,13 +1,71 @@
+from functools import lru_cache
+from datetime import datetime
 import pandas as pd
 import pymysql
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.pool import QueuePool
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from app.services.batch_history import append_batch_log
 from app.utils.logger import get_logger
 from app.utils.config import get_settings
 
 logger = get_logger(__name__)
 
+# 추천 저장 레코드: (user_id, item_id, item_type, score)
+RecommendationRow = Tuple[int, int, str, float]
+
+# 추천 저장 SQL (모듈 로드 시 한 번만 구성 - SQLAlchemy 컴파일 캐시 재사용)
+_DELETE_RECOMMENDATIONS = text(
+    "DELETE FROM recommendations WHERE user_id IN :user_ids"
+).bindparams(bindparam('user_ids', expanding=True))
+_INSERT_RECOMMENDATIONS_SQL = (
+    "INSERT INTO recommendations (user_id, item_id, item_type, score, created_at) "
+    "VALUES (%s, %s, %s, %s, NOW())"
+)
+
+# 비동기 엔진 (프로세스당 하나만 생성하여 커넥션 풀 공유)
+_async_engine: Optional[AsyncEngine] = None
+
+def _build_db_url(settings) -> str:
+    """설정에서 DB URL 구성"""
+    # YAML 설정에서 DB URL 가져오기
+    db_url = settings.db_url
+    
+    if not db_url:
+        # URL이 없으면 개별 설정으로 구성
+        db_url = (
+            f"mysql+pymysql://{settings.db_user}:{settings.db_password}"
+            f"@{settings.db_host}:{settings.db_port}/{settings.db_name}"
+            f"?charset=utf8mb4"
+        )
+    return db_url
+
+def get_async_engine() -> AsyncEngine:
+    """비동기 SQLAlchemy 엔진 반환 (aiomysql 드라이버, lazy 생성)"""
+    global _async_engine
+    if _async_engine is None:
+        settings = get_settings()
+        db_url = _build_db_url(settings).replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+        pool_config = settings.get('datasource.pool', {})
+        _async_engine = create_async_engine(
+            db_url,
+            pool_size=pool_config.get('size', 5),
+            max_overflow=pool_config.get('max_overflow', 10),
+            pool_pre_ping=pool_config.get('pre_ping', True),
+            pool_recycle=pool_config.get('recycle', 3600),
+            echo=settings.debug
+        )
+        logger.info("✅ MySQL 비동기 엔진 생성 (aiomysql)")
+    return _async_engine
+
+async def dispose_async_engine():
+    """비동기 엔진 커넥션 풀 정리 (애플리케이션 종료 시)"""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
 class DatabaseService:
     """MySQL 데이터베이스 연동 서비스"""
     
@@ -19,16 +77,7 @@ class DatabaseService:
     def _connect(self):
         """데이터베이스 연결 설정"""
         try:
-            # YAML 설정에서 DB URL 가져오기
-            db_url = self.settings.db_url
-            
-            if not db_url:
-                # URL이 없으면 개별 설정으로 구성
-                db_url = (
-                    f"mysql+pymysql://{self.settings.db_user}:{self.settings.db_password}"
-                    f"@{self.settings.db_host}:{self.settings.db_port}/{self.settings.db_name}"
-                    f"?charset=utf8mb4"
-                )
+            db_url = _build_db_url(self.settings)
             
             # SQLAlchemy 엔진 생성
             pool_config = self.settings.get('datasource.pool', {})
@@ -56,6 +105,31 @@ class DatabaseService:
     
     def get_user_item_interactions(self) -> pd.DataFrame:
         """사용자-아이템 상호작용 데이터 조회 (user_actions 테이블 기반)"""
+        try:
+            with self.engine.connect() as conn:
+                return self._query_user_item_interactions(conn)
+        except Exception as e:
+            logger.error(f"❌ user_actions 상호작용 데이터 조회 실패: {str(e)}")
+            # 기존 방식으로 fallback
+            return self._get_legacy_user_item_interactions()
+    
+    async def get_user_item_interactions_async(self) -> pd.DataFrame:
+        """사용자-아이템 상호작용 데이터 조회 (비동기, API 핸들러용)"""
+        try:
+            async with get_async_engine().connect() as conn:
+                return await conn.run_sync(self._query_user_item_interactions)
+        except Exception as e:
+            logger.error(f"❌ user_actions 상호작용 데이터 조회 실패: {str(e)}")
+            # 기존 방식으로 fallback
+            try:
+                async with get_async_engine().connect() as conn:
+                    return await conn.run_sync(self._query_legacy_user_item_interactions)
+            except Exception as legacy_error:
+                logger.error(f"❌ 기존 방식 상호작용 데이터 조회 실패: {str(legacy_error)}")
+                return pd.DataFrame()
+    
+    def _query_user_item_interactions(self, conn) -> pd.DataFrame:
+        """user_actions 기반 상호작용 쿼리 실행 (sync/async 커넥션 공용)"""
         query = """
         SELECT 
             ua.user_id,
@@ -87,29 +161,32 @@ class DatabaseService:
         LIMIT 50000  -- 더 많은 데이터 로드
         """
         
+        df = pd.read_sql(query, conn)
+        logger.info(f"✅ user_actions 기반 상호작용 데이터 조회 완료: {len(df)}건 (공개 로그만)")
+        logger.info(f"   - 액션 타입별 분포:")
+        if len(df) > 0:
+            action_counts = df['action_type'].value_counts()
+            for action, count in action_counts.items():
+                logger.info(f"     * {action}: {count}건")
+            
+            # 타겟 타입별 분포도 확인
+            target_counts = df['target_type'].value_counts()
+            logger.info(f"   - 타겟 타입별 분포:")
+            for target, count in target_counts.items():
+                logger.info(f"     * {target}: {count}건")
+        return df
+    
+    def _get_legacy_user_item_interactions(self) -> pd.DataFrame:
+        """기존 방식의 상호작용 데이터 조회 (fallback용)"""
         try:
             with self.engine.connect() as conn:
-                df = pd.read_sql(query, conn)
-            logger.info(f"✅ user_actions 기반 상호작용 데이터 조회 완료: {len(df)}건 (공개 로그만)")
-            logger.info(f"   - 액션 타입별 분포:")
-            if len(df) > 0:
-                action_counts = df['action_type'].value_counts()
-                for action, count in action_counts.items():
-                    logger.info(f"     * {action}: {count}건")
-                
-                # 타겟 타입별 분포도 확인
-                target_counts = df['target_type'].value_counts()
-                logger.info(f"   - 타겟 타입별 분포:")
-                for target, count in target_counts.items():
-                    logger.info(f"     * {target}: {count}건")
-            return df
+                return self._query_legacy_user_item_interactions(conn)
         except Exception as e:
-            logger.error(f"❌ user_actions 상호작용 데이터 조회 실패: {str(e)}")
-            # 기존 방식으로 fallback
-            return self._get_legacy_user_item_interactions()
+            logger.error(f"❌ 기존 방식 상호작용 데이터 조회 실패: {str(e)}")
+            return pd.DataFrame()
     
-    def _get_legacy_user_item_interactions(self) -> pd.DataFrame:
-        """기존 방식의 상호작용 데이터 조회 (fallback용)"""
+    def _query_legacy_user_item_interactions(self, conn) -> pd.DataFrame:
+        """기존 방식 상호작용 쿼리 실행 (likes/log_comment/log 테이블)"""
         query = """
         SELECT 
             ua.user_id,
@@ -159,20 +236,36 @@ class DatabaseService:
         LIMIT 10000
         """
         
+        df = pd.read_sql(query, conn)
+        logger.info(f"✅ 기존 방식 상호작용 데이터 조회 완료: {len(df)}건")
+        return df
+    
+    def get_item_metadata(self, item_ids: List[int]) -> Dict[str, Dict[str, Any]]:
+        """아이템(여행 기록) 메타데이터 조회"""
+        if not item_ids:
+            return {}
+        
         try:
             with self.engine.connect() as conn:
-                df = pd.read_sql(query, conn)
-            logger.info(f"✅ 기존 방식 상호작용 데이터 조회 완료: {len(df)}건")
-            return df
+                return self._query_item_metadata(conn, item_ids)
         except Exception as e:
-            logger.error(f"❌ 기존 방식 상호작용 데이터 조회 실패: {str(e)}")
-            return pd.DataFrame()
+            logger.error(f"❌ 메타데이터 조회 실패: {str(e)}")
+            return {}
     
-    def get_item_metadata(self, item_ids: List[int]) -> Dict[str, Dict[str, Any]]:
-        """아이템(여행 기록) 메타데이터 조회"""
+    async def get_item_metadata_async(self, item_ids: List[int]) -> Dict[str, Dict[str, Any]]:
+        """아이템(여행 기록) 메타데이터 조회 (비동기, API 핸들러용)"""
         if not item_ids:
             return {}
-            
+        
+        try:
+            async with get_async_engine().connect() as conn:
+                return await conn.run_sync(self._query_item_metadata, item_ids)
+        except Exception as e:
+            logger.error(f"❌ 메타데이터 조회 실패: {str(e)}")
+            return {}
+    
+    def _query_item_metadata(self, conn, item_ids: List[int]) -> Dict[str, Dict[str, Any]]:
+        """메타데이터 쿼리 실행 및 딕셔너리 변환"""
         # 안전한 방식으로 수정: named parameter로 변경하기보다는 확실한 tuple 사용
         placeholders = ','.join(['%s'] * len(item_ids))
         query = f"""
@@ -194,38 +287,64 @@ class DatabaseService:
         GROUP BY l.log_id, l.comment, l.created_at, u.name, p.nickname
         """
         
-        try:
-            with self.engine.connect() as conn:
-                # pandas read_sql은 tuple을 안전하게 처리하지만, 명시적으로 변환
-                df = pd.read_sql(query, conn, params=tuple(int(item_id) for item_id in item_ids))
-            
-            metadata = {}
-            for _, row in df.iterrows():
-                metadata[str(row['log_id'])] = {
-                    "title": f"여행 기록 {row['log_id']}",  # 기본 제목
-                    "description": row['description'][:200] if row['description'] else "",
-                    "image_url": None,  # 실제 테이블에 없음
-                    "category": "여행",  # 기본값
-                    "location": "미지정",  # 기본값
-                    "author_name": row['author_name'],
-                    "author_nickname": row['author_nickname'],
-                    "created_at": row['created_at'].isoformat() if row['created_at'] else None,
-                    "popularity_rank": int(row['like_count']) + int(row['comment_count']),
-                    "extra": {
-                        "like_count": int(row['like_count']),
-                        "comment_count": int(row['comment_count'])
-                    }
+        # DataFrame 없이 DBAPI 결과를 바로 순회 (파라미터는 명시적으로 int 변환)
+        result = conn.exec_driver_sql(query, tuple(int(item_id) for item_id in item_ids))
+        
+        metadata = {}
+        for row in result.mappings():
+            metadata[str(row['log_id'])] = {
+                "title": f"여행 기록 {row['log_id']}",  # 기본 제목
+                "description": row['description'][:200] if row['description'] else "",
+                "image_url": None,  # 실제 테이블에 없음
+                "category": "여행",  # 기본값
+                "location": "미지정",  # 기본값
+                "author_name": row['author_name'],
+                "author_nickname": row['author_nickname'],
+                "created_at": row['created_at'].isoformat() if row['created_at'] else None,
+                "popularity_rank": int(row['like_count']) + int(row['comment_count']),
+                "extra": {
+                    "like_count": int(row['like_count']),
+                    "comment_count": int(row['comment_count'])
                 }
-            
-            logger.info(f"✅ 메타데이터 조회 완료: {len(metadata)}개")
-            return metadata
-            
-        except Exception as e:
-            logger.error(f"❌ 메타데이터 조회 실패: {str(e)}")
-            return {}
+            }
+        
+        logger.info(f"✅ 메타데이터 조회 완료: {len(metadata)}개")
+        return metadata
     
     def get_popular_items(self, rec_type: str, limit: int) -> List[int]:
         """인기 아이템 조회 (user_actions 기반으로 수정)"""
+        try:
+            with self.engine.connect() as conn:
+                return self._query_popular_items(conn, rec_type, limit)
+        except Exception as e:
+            logger.error(f"❌ 인기 아이템 조회 실패: {str(e)}")
+            # 최종 폴백: 랜덤 공개 로그 반환
+            try:
+                with self.engine.connect() as conn:
+                    return self._query_random_public_logs(conn, limit)
+            except Exception as final_error:
+                logger.error(f"❌ 최종 폴백도 실패: {str(final_error)}")
+                # 정말 마지막 수단: 순차적 ID
+                return list(range(1, limit + 1))
+    
+    async def get_popular_items_async(self, rec_type: str, limit: int) -> List[int]:
+        """인기 아이템 조회 (비동기, API 핸들러용)"""
+        try:
+            async with get_async_engine().connect() as conn:
+                return await conn.run_sync(self._query_popular_items, rec_type, limit)
+        except Exception as e:
+            logger.error(f"❌ 인기 아이템 조회 실패: {str(e)}")
+            # 최종 폴백: 랜덤 공개 로그 반환
+            try:
+                async with get_async_engine().connect() as conn:
+                    return await conn.run_sync(self._query_random_public_logs, limit)
+            except Exception as final_error:
+                logger.error(f"❌ 최종 폴백도 실패: {str(final_error)}")
+                # 정말 마지막 수단: 순차적 ID
+                return list(range(1, limit + 1))
+    
+    def _query_popular_items(self, conn, rec_type: str, limit: int) -> List[int]:
+        """인기 아이템 쿼리 실행 (부족분은 최신/랜덤 공개 로그로 보완)"""
         if rec_type == "record":
             # 먼저 user_actions 기반으로 인기도 계산 시도 (조건 대폭 완화)
             query = """
@@ -263,88 +382,74 @@ class DatabaseService:
             LIMIT %s
             """
         
-        try:
-            with self.engine.connect() as conn:
-                df = pd.read_sql(query, conn, params=(limit * 2,))  # 여유분 확보
+        item_ids = list(conn.exec_driver_sql(query, (limit * 2,)).scalars())  # 여유분 확보
+        
+        # 결과가 부족하면 최신 공개 로그로 강력하게 보완
+        if len(item_ids) < limit:
+            logger.warning(f"⚠️ 인기 아이템 부족 ({len(item_ids)}/{limit}), 최신 공개 로그로 보완")
             
-            item_ids = df['log_id'].tolist()
+            # 이미 선택된 아이템 제외하고 추가 조회
+            exclude_clause = ""
+            if item_ids:
+                exclude_clause = f"AND log_id NOT IN ({','.join(map(str, item_ids))})"
             
-            # 결과가 부족하면 최신 공개 로그로 강력하게 보완
-            if len(item_ids) < limit:
-                logger.warning(f"⚠️ 인기 아이템 부족 ({len(item_ids)}/{limit}), 최신 공개 로그로 보완")
-                
-                # 이미 선택된 아이템 제외하고 추가 조회
-                exclude_clause = ""
-                if item_ids:
-                    exclude_clause = f"AND log_id NOT IN ({','.join(map(str, item_ids))})"
-                
-                fallback_query = f"""
-                SELECT log_id
-                FROM log
-                WHERE is_public = 1
-                  {exclude_clause}
-                ORDER BY created_at DESC
-                LIMIT %s
-                """
-                
-                remaining_limit = limit - len(item_ids)
-                df_fallback = pd.read_sql(fallback_query, conn, params=(remaining_limit,))
-                fallback_ids = df_fallback['log_id'].tolist()
-                item_ids.extend(fallback_ids)
-                
-                logger.info(f"📈 fallback으로 {len(fallback_ids)}개 추가, 총 {len(item_ids)}개")
+            fallback_query = f"""
+            SELECT log_id
+            FROM log
+            WHERE is_public = 1
+              {exclude_clause}
+            ORDER BY created_at DESC
+            LIMIT %s
+            """
             
-            # 여전히 부족하면 랜덤 선택으로 채우기
-            if len(item_ids) < limit:
-                logger.warning(f"🎲 여전히 부족 ({len(item_ids)}/{limit}), 랜덤 선택으로 채우기")
-                
-                # 이미 선택된 아이템 제외하고 랜덤 조회
-                exclude_clause = ""
-                if item_ids:
-                    exclude_clause = f"AND log_id NOT IN ({','.join(map(str, item_ids))})"
-                
-                random_query = f"""
-                SELECT log_id
-                FROM log
-                WHERE is_public = 1
-                  {exclude_clause}
-                ORDER BY RAND()
-                LIMIT %s
-                """
-                
-                remaining_limit = limit - len(item_ids)
-                df_random = pd.read_sql(random_query, conn, params=(remaining_limit,))
-                random_ids = df_random['log_id'].tolist()
-                item_ids.extend(random_ids)
-                
-                logger.info(f"🎲 랜덤 선택으로 {len(random_ids)}개 추가, 총 {len(item_ids)}개")
+            remaining_limit = limit - len(item_ids)
+            fallback_ids = list(conn.exec_driver_sql(fallback_query, (remaining_limit,)).scalars())
+            item_ids.extend(fallback_ids)
             
-            # 최종적으로 limit만큼 자르기
-            final_items = item_ids[:limit]
+            logger.info(f"📈 fallback으로 {len(fallback_ids)}개 추가, 총 {len(item_ids)}개")
+        
+        # 여전히 부족하면 랜덤 선택으로 채우기
+        if len(item_ids) < limit:
+            logger.warning(f"🎲 여전히 부족 ({len(item_ids)}/{limit}), 랜덤 선택으로 채우기")
             
-            logger.info(f"✅ 인기 아이템 조회 완료: {len(final_items)}개 (요청: {limit}개)")
-            return final_items
+            # 이미 선택된 아이템 제외하고 랜덤 조회
+            exclude_clause = ""
+            if item_ids:
+                exclude_clause = f"AND log_id NOT IN ({','.join(map(str, item_ids))})"
             
-        except Exception as e:
-            logger.error(f"❌ 인기 아이템 조회 실패: {str(e)}")
-            # 최종 폴백: 랜덤 공개 로그 반환
-            try:
-                with self.engine.connect() as conn:
-                    fallback_query = """
-                    SELECT log_id
-                    FROM log
-                    WHERE is_public = 1
-                    ORDER BY RAND()
-                    LIMIT %s
-                    """
-                    df = pd.read_sql(fallback_query, conn, params=(limit,))
-                    result = df['log_id'].tolist()
-                    logger.info(f"🔄 최종 랜덤 폴백 성공: {len(result)}개")
-                    return result
-            except Exception as final_error:
-                logger.error(f"❌ 최종 폴백도 실패: {str(final_error)}")
-                # 정말 마지막 수단: 순차적 ID
-                return list(range(1, limit + 1))
+            random_query = f"""
+            SELECT log_id
+            FROM log
+            WHERE is_public = 1
+              {exclude_clause}
+            ORDER BY RAND()
+            LIMIT %s
+            """
+            
+            remaining_limit = limit - len(item_ids)
+            random_ids = list(conn.exec_driver_sql(random_query, (remaining_limit,)).scalars())
+            item_ids.extend(random_ids)
+            
+            logger.info(f"🎲 랜덤 선택으로 {len(random_ids)}개 추가, 총 {len(item_ids)}개")
+        
+        # 최종적으로 limit만큼 자르기
+        final_items = item_ids[:limit]
+        
+        logger.info(f"✅ 인기 아이템 조회 완료: {len(final_items)}개 (요청: {limit}개)")
+        return final_items
+    
+    def _query_random_public_logs(self, conn, limit: int) -> List[int]:
+        """랜덤 공개 로그 조회 (인기 아이템 조회 실패 시 폴백)"""
+        fallback_query = """
+        SELECT log_id
+        FROM log
+        WHERE is_public = 1
+        ORDER BY RAND()
+        LIMIT %s
+        """
+        result = list(conn.exec_driver_sql(fallback_query, (limit,)).scalars())
+        logger.info(f"🔄 최종 랜덤 폴백 성공: {len(result)}개")
+        return result
     
     def get_user_preferences(self, user_id: int) -> Dict[str, Any]:
         """사용자 선호도 정보 조회"""
@@ -398,46 +503,19 @@ class DatabaseService:
             self.engine.dispose()
             logger.info("데이터베이스 연결 종료")
     
-    def save_recommendations_batch(self, recommendations: List[Dict[str, Any]], batch_id: int) -> bool:
-        """추천 결과를 recommendations 테이블에 배치 저장"""
+    def save_recommendations_batch(self, recommendations: List[RecommendationRow], batch_id: int) -> bool:
+        """추천 결과를 recommendations 테이블에 배치 저장
+        
+        recommendations: (user_id, item_id, item_type, score) 튜플 목록 - executemany에 그대로 전달
+        """
         if not recommendations:
             return True
             
         try:
-            # 기존 추천 결과 삭제 (사용자별)
-            user_ids = list(set([rec['user_id'] for rec in recommendations]))
-            
             with self.engine.begin() as conn:
-                # 1. 기존 데이터 삭제 - named parameter 방식으로 수정
-                if user_ids:
-                    # 하나씩 삭제하는 방식으로 변경 (더 안전)
-                    delete_query = text("DELETE FROM recommendations WHERE user_id = :user_id")
-                    for user_id in user_ids:
-                        conn.execute(delete_query, {'user_id': int(user_id)})
-                    logger.info(f"🗑️ 기존 추천 데이터 삭제 완료: {len(user_ids)}명")
-                
-                # 2. 새 데이터 삽입 - 하나씩 삽입하는 안전한 방법
-                insert_query = text("""
-                    INSERT INTO recommendations 
-                    (user_id, item_id, item_type, score, created_at)
-                    VALUES (:user_id, :item_id, :item_type, :score, NOW())
-                """)
-                
-                inserted_count = 0
-                for rec in recommendations:
-                    try:
-                        conn.execute(insert_query, {
-                            'user_id': int(rec['user_id']),
-                            'item_id': int(rec['item_id']), 
-                            'item_type': str(rec['item_type']),
-                            'score': float(rec['score'])
-                        })
-                        inserted_count += 1
-                    except Exception as insert_error:
-                        logger.warning(f"⚠️ 개별 추천 삽입 실패: user_id={rec.get('user_id')}, item_id={rec.get('item_id')}, error={str(insert_error)}")
-                        continue
-            
-            logger.info(f"✅ 추천 결과 배치 저장 완료: {inserted_count}/{len(recommendations)}건")
+                self._write_recommendations(conn, recommendations)
+            
+            logger.info(f"✅ 추천 결과 배치 저장 완료: {len(recommendations)}건")
             return True
             
         except Exception as e:
@@ -446,23 +524,50 @@ class DatabaseService:
             logger.error(f"상세 오류: {traceback.format_exc()}")
             return False
     
+    async def save_recommendations_batch_async(self, recommendations: List[RecommendationRow], batch_id: int) -> bool:
+        """추천 결과 배치 저장 (비동기, 배치 저장 파이프라인용)
+        
+        비동기 엔진 풀의 커넥션을 재사용하므로 저장마다 스레드/커넥션을 새로 잡지 않는다.
+        """
+        if not recommendations:
+            return True
+            
+        try:
+            async with get_async_engine().begin() as conn:
+                await conn.run_sync(self._write_recommendations, recommendations)
+            
+            logger.info(f"✅ 추천 결과 배치 저장 완료: {len(recommendations)}건")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ 추천 결과 배치 저장 실패: {str(e)}")
+            import traceback
+            logger.error(f"상세 오류: {traceback.format_exc()}")
+            return False
+    
+    def _write_recommendations(self, conn, recommendations: List[RecommendationRow]):
+        """기존 추천 삭제 후 새 추천 삽입 (sync/async 커넥션 공용, 트랜잭션은 호출자가 관리)"""
+        user_ids = sorted({int(row[0]) for row in recommendations})
+        
+        # 1. 기존 데이터 삭제 - 사용자 목록을 IN 절 하나로 처리
+        conn.execute(_DELETE_RECOMMENDATIONS, {'user_ids': user_ids})
+        logger.info(f"🗑️ 기존 추천 데이터 삭제 완료: {len(user_ids)}명")
+        
+        # 2. 새 데이터 삽입 - 튜플 목록을 드라이버 executemany로 한 번에 처리
+        # (pymysql/aiomysql 모두 INSERT ... VALUES executemany를 다중 행 INSERT로 묶어 전송)
+        conn.exec_driver_sql(_INSERT_RECOMMENDATIONS_SQL, recommendations)
+    
     def create_batch_log(self, batch_type: str, total_users: int) -> Optional[int]:
         """배치 처리 로그 생성 (파일 로그만 사용)"""
         try:
             # DB 대신 파일 로그만 사용
-            import os
-            from datetime import datetime
-            
-            log_file = "/app/logs/batch.log"
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
             log_entry = f"[{timestamp}] {batch_type.upper()} BATCH STARTED - "
-            log_entry += f"Total Users: {total_users}, Status: started\n"
+            log_entry += f"Total Users: {total_users}, Status: started"
             
-            # 로그 파일에 기록
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            # 로그 파일에 기록 (버퍼링된 백그라운드 기록)
+            append_batch_log(log_entry)
             
             logger.info(f"✅ 배치 로그 생성 (파일): type={batch_type}, users={total_users}")
             
@@ -480,10 +585,6 @@ class DatabaseService:
         """배치 처리 로그 업데이트 (파일 로그만 사용)"""
         try:
             # DB 대신 파일 로그만 사용
-            import os
-            from datetime import datetime
-            
-            log_file = "/app/logs/batch.log"
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
             # 배치 타입 추정 (batch_id로는 알 수 없으므로 간단히 BATCH로 표시)
@@ -493,12 +594,8 @@ class DatabaseService:
             if error_message:
                 log_entry += f", Error: {error_message}"
             
-            log_entry += "\n"
-            
-            # 로그 파일에 기록
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            # 로그 파일에 기록 (버퍼링된 백그라운드 기록)
+            append_batch_log(log_entry)
             
             logger.info(f"✅ 배치 로그 업데이트 (파일): status={status}, users={processed_users}")
             return True
@@ -507,17 +604,19 @@ class DatabaseService:
             logger.error(f"❌ 배치 로그 업데이트 실패: {str(e)}")
             return False
     
-    def get_users_for_batch_processing(self, batch_type: str = "full") -> List[int]:
-        """배치 처리 대상 사용자 조회"""
+    def get_users_for_batch_processing(self, batch_type: str = "full", limit: Optional[int] = None) -> List[int]:
+        """배치 처리 대상 사용자 조회 (limit를 주면 DB에서 user_id 순 앞쪽 limit명만 조회)"""
+        params = {}
         if batch_type == "incremental":
-            # 최근 활동한 사용자만 (24시간으로 확장)
+            # 최근 활동한 사용자만 (24시간으로 확장, 기본 최대 1000명)
             query = """
             SELECT DISTINCT user_id 
             FROM user_actions 
             WHERE action_time >= DATE_SUB(NOW(), INTERVAL 24 HOUR)
             ORDER BY user_id
-            LIMIT 1000
+            LIMIT :limit
             """
+            params['limit'] = int(limit) if limit is not None else 1000
         else:
             # 전체 사용자 (모든 user_actions 데이터, 날짜 제한 없음)
             query = """
@@ -525,11 +624,14 @@ class DatabaseService:
             FROM user_actions 
             ORDER BY user_id
             """
+            if limit is not None:
+                query += "LIMIT :limit"
+                params['limit'] = int(limit)
         
         try:
             # 메인 쿼리 실행
             with self.engine.connect() as conn:
-                df = pd.read_sql(query, conn)
+                df = pd.read_sql(text(query), conn, params=params)
             
             user_ids = df['user_id'].tolist()
             logger.info(f"✅ 배치 처리 대상 사용자 조회: {len(user_ids)}명 ({batch_type})")
@@ -543,8 +645,8 @@ class DatabaseService:
             except Exception as e:
                 logger.warning(f"⚠️ 전체 통계 조회 실패 (무시함): {str(e)}")
             
-            # 날짜별 분포도 확인 (새로운 커넥션 사용)
-            if batch_type == "full":
+            # 날짜별 분포도 확인 (새로운 커넥션 사용, 일부 사용자만 조회할 때는 생략)
+            if batch_type == "full" and limit is None:
                 try:
                     with self.engine.connect() as conn:
                         date_query = """
@@ -568,4 +670,37 @@ class DatabaseService:
             
         except Exception as e:
             logger.error(f"❌ 배치 처리 대상 사용자 조회 실패: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+    
+    def count_users_for_batch_processing(self) -> int:
+        """전체 배치 대상 사용자 수 (조회 실패 시 0)"""
+        try:
+            with self.engine.connect() as conn:
+                total = conn.execute(text("SELECT COUNT(DISTINCT user_id) FROM user_actions")).scalar() or 0
+            logger.info(f"✅ 배치 처리 대상 사용자 수: {total}명 (full)")
+            return int(total)
+        except Exception as e:
+            logger.error(f"❌ 배치 처리 대상 사용자 수 조회 실패: {str(e)}")
+            return 0
+    
+    def get_user_page_for_batch_processing(self, after_user_id: Optional[int], page_size: int) -> List[int]:
+        """전체 배치 대상 사용자를 user_id 순으로 after_user_id 다음부터 page_size명 조회 (keyset 페이지네이션)
+        
+        OFFSET 없이 마지막 user_id 기준으로 이어 읽으므로 뒤쪽 페이지도 조회 비용이 같다.
+        조회 실패는 호출자가 배치 실패로 처리하도록 예외를 그대로 전달한다.
+        """
+        query = "SELECT DISTINCT user_id FROM user_actions "
+        params = {'limit': int(page_size)}
+        if after_user_id is not None:
+            query += "WHERE user_id > :after_user_id "
+            params['after_user_id'] = int(after_user_id)
+        query += "ORDER BY user_id LIMIT :limit"
+        
+        with self.engine.connect() as conn:
+            return conn.execute(text(query), params).scalars().all()
+
+# DatabaseService 인스턴스 (전역으로 한 번만 생성)
+@lru_cache()
+def get_database_service() -> DatabaseService:
+    """DatabaseService 싱글톤 반환 (프로세스당 하나의 동기 엔진/커넥션 풀 공유)"""
+    return DatabaseService()
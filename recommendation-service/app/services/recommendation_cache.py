@@ -0,0 +1,60 @@
+import threading
+from typing import Any, Hashable, Optional
+
+from cachetools import TTLCache
+
+from app.utils.config import get_settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class RecommendationCache:
+    """추천 응답 캐시 (LRU + TTL)
+
+    키에 캐시 버전을 포함하므로 invalidate()는 버전만 올려 O(1)로 무효화하고,
+    이전 버전 엔트리는 TTL/LRU에 의해 자연스럽게 제거된다.
+    조회 → 추천 계산 → 저장 사이에 무효화되면 이전 모델 결과가 새 버전으로 저장되지 않도록
+    조회 시점 버전(snapshot_version)을 set()에 넘긴다.
+    """
+
+    def __init__(self, maxsize: int = 50_000, ttl: int = 300):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def snapshot_version(self) -> int:
+        """현재 캐시 버전 (조회 전에 받아 get/set에 전달)"""
+        with self._lock:
+            return self.version
+
+    def get(self, key: Hashable, version: Optional[int] = None) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None, version을 주면 그 버전 엔트리만 조회)"""
+        with self._lock:
+            return self._cache.get((self.version if version is None else version, key))
+
+    def set(self, key: Hashable, value: Any, version: int):
+        """캐시 저장 (version 이후 invalidate()가 호출됐으면 이전 모델 결과이므로 저장하지 않음)"""
+        with self._lock:
+            if version != self.version:
+                return
+            self._cache[(version, key)] = value
+
+    def invalidate(self):
+        """캐시 버전 증가로 기존 엔트리 전체 무효화"""
+        with self._lock:
+            self.version += 1
+        logger.info(f"🧹 추천 캐시 무효화 (version={self.version})")
+
+# 추천 캐시 인스턴스 (전역으로 한 번만 생성)
+_recommendation_cache = None
+
+def get_recommendation_cache() -> RecommendationCache:
+    """추천 캐시 인스턴스 반환 (lazy loading)"""
+    global _recommendation_cache
+    if _recommendation_cache is None:
+        settings = get_settings()
+        _recommendation_cache = RecommendationCache(
+            maxsize=settings.get('performance.response_cache_size', 50_000),
+            ttl=settings.get('performance.response_cache_ttl', 300)
+        )
+    return _recommendation_cache
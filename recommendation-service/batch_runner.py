@@ -18,6 +18,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 
 from app.services.batch_service import BatchService
+from app.services.database_service import dispose_async_engine
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -29,12 +30,11 @@ class BatchRunner:
         self.batch_service = BatchService()
         self.running = True
     
-    def signal_handler(self, signum, frame):
-        """시그널 핸들러 (Ctrl+C 등)"""
+    def signal_handler(self, signum):
+        """시그널 핸들러 (Ctrl+C 등) - 스케줄 태스크를 취소해 run_scheduler가 정상 종료되도록 함"""
         logger.info(f"📡 시그널 {signum} 수신, 종료 처리 시작...")
         self.running = False
         self.batch_service.stop_scheduler()
-        sys.exit(0)
     
     async def run_once(self, mode: str):
         """일회성 배치 실행"""
@@ -59,8 +59,10 @@ class BatchRunner:
         except Exception as e:
             logger.error(f"❌ 배치 실행 중 오류: {str(e)}")
             return False
+        finally:
+            await dispose_async_engine()
     
-    def run_scheduler(self):
+    async def run_scheduler(self):
         """스케줄러 모드 실행"""
         logger.info("🕐 스케줄러 모드 시작")
         logger.info("   - 초기 전체 배치: 즉시 실행")
@@ -68,26 +70,27 @@ class BatchRunner:
         logger.info("   - 증분 배치: 6시간마다")
         logger.info("   - 종료: Ctrl+C")
         
-        # 시그널 핸들러 등록
-        signal.signal(signal.SIGINT, self.signal_handler)
-        signal.signal(signal.SIGTERM, self.signal_handler)
+        # 시그널 핸들러 등록 (이벤트 루프에서 처리)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.signal_handler, signum)
         
         try:
             # 시작 시 즉시 전체 배치 실행
             logger.info("🚀 시작 시 초기 전체 배치 실행...")
-            initial_success = asyncio.run(self.batch_service.run_full_batch())
+            initial_success = await self.batch_service.run_full_batch()
             if initial_success:
                 logger.info("✅ 초기 전체 배치 완료")
             else:
                 logger.warning("⚠️ 초기 전체 배치 실패 - 스케줄러는 계속 실행")
             
-            # 스케줄러 시작 (블로킹)
-            self.batch_service.start_scheduler()
-        except KeyboardInterrupt:
-            logger.info("🛑 사용자 중단 요청")
+            # 스케줄러 시작 (중지될 때까지 대기)
+            if self.running:
+                await self.batch_service.start_scheduler()
         except Exception as e:
             logger.error(f"❌ 스케줄러 실행 오류: {str(e)}")
         finally:
+            await dispose_async_engine()
             logger.info("⏹️ 배치 스케줄러 종료")
 
 def main():
@@ -132,7 +135,7 @@ def main():
     try:
         if args.mode == "scheduler":
             # 스케줄러 모드
-            runner.run_scheduler()
+            asyncio.run(runner.run_scheduler())
         else:
             # 일회성 실행 모드
             success = asyncio.run(runner.run_once(args.mode))
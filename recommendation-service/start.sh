@@ -58,10 +58,14 @@ echo "📝 배치 스케줄러 PID: $BATCH_PID"
 # 잠시 대기 (스케줄러 초기화)
 sleep 3
 
-# FastAPI 서버 시작
-echo "🌐 FastAPI 서버 시작 (포트: 8000)..."
+# FastAPI 서버 시작 (기본 워커 1개)
+# 모델 refresh/추천 캐시 무효화/수동 배치 상태·이력은 프로세스 메모리에 있어 워커 간 공유되지 않으므로
+# 여러 워커는 UVICORN_WORKERS로 명시할 때만 사용 (ALS 팩터 행렬은 mmap으로 워커 간 공유)
+UVICORN_WORKERS="${UVICORN_WORKERS:-1}"
+echo "🌐 FastAPI 서버 시작 (포트: 8000, 워커: $UVICORN_WORKERS)..."
 cd /app
-nohup uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers 1 > /app/logs/server.log 2>&1 &
+nohup uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers "$UVICORN_WORKERS" \
+    --loop uvloop --http httptools > /app/logs/server.log 2>&1 &
 SERVER_PID=$!
 echo "📝 FastAPI 서버 PID: $SERVER_PID"
 